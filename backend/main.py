@@ -1,30 +1,103 @@
 import os
 import re
-import base64
+import sys
+import hashlib
 import logging
+from collections.abc import AsyncIterator, Mapping
+from functools import lru_cache
 from pathlib import Path
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
 from dotenv import load_dotenv
 import httpx
+import orjson
+import pybase64
 
-from services.pdf_parser import extract_text_from_pdf, pdf_to_images_base64
-from services.ai_validator import validate_invoice, validate_invoice_with_image
-from models.schemas import ValidationResult, InvoiceType, Language, InvoicePayload
+from services.ai_validator import validate_invoice, validate_invoice_with_image, get_client, close_client
+from services.pdf_parser import extract_text_from_pdf, pdf_to_images_base64, start_page_pool, shutdown_page_pool, warm_up as warm_up_pdf_parser
+from services.requirements import get_requirements_for_type
+from services.llm_cache import hash_content, make_cache_key, get_cached_result, cache_result
+from models.schemas import ValidationResult, ExtractedInvoiceData, CheckStatus, InvoiceType, Language, InvoicePayload, INVOICE_TYPE_BY_VALUE, LANGUAGE_BY_VALUE
 
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file in the same directory as this file
+# Load environment variables from .env file in the same directory as this file,
+# without overriding variables injected by the deployment environment
 env_path = Path(__file__).parent / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
+load_dotenv(dotenv_path=env_path, override=False)
 
 app = FastAPI(
     title="Invoice Checker API",
     description="API for validating invoices against Sunday's requirements",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Largest PDF accepted from any source (upload, base64 payload or contentUrl)
+MAX_PDF_BYTES = 25 * 1024 * 1024
+# Base64 encodes 3 bytes as 4 characters
+MAX_BASE64_CHARS = -(-MAX_PDF_BYTES // 3) * 4
+
+FILE_TOO_LARGE_DETAIL = f"File too large. Maximum size is {MAX_PDF_BYTES // (1024 * 1024)} MB"
+
+# Largest JSON payload accepted: the base64 content plus room for the other fields
+MAX_JSON_BODY_BYTES = MAX_BASE64_CHARS + 64 * 1024
+
+# Largest multipart upload accepted: the PDF plus room for the boundaries,
+# part headers and the other form fields
+MAX_UPLOAD_BODY_BYTES = MAX_PDF_BYTES + 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject an oversized request body on one route with 413.
+
+    FastAPI parses and spools a whole multipart form before the endpoint runs,
+    so the endpoint itself is too late to refuse a huge upload. A declared
+    Content-Length over the limit is answered straight away; a body without
+    one is cut off as soon as the bytes received pass the limit.
+    """
+
+    def __init__(self, app, path: str, max_bytes: int):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            _check_content_length(Headers(scope=scope), self.max_bytes)
+        except HTTPException as e:
+            await ORJSONResponse({"detail": e.detail}, status_code=e.status_code)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def capped_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside the form parsing, so it becomes a normal 413 response
+                    raise HTTPException(status_code=413, detail=FILE_TOO_LARGE_DETAIL)
+            return message
+
+        await self.app(scope, capped_receive, send)
+
+
+# Added before CORS so the CORS middleware wraps it and 413s keep their CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, path="/api/analyze", max_bytes=MAX_UPLOAD_BODY_BYTES)
+
 # Configure CORS for frontend
 # Get allowed origins from environment variable, with defaults for local development
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
@@ -67,6 +140,354 @@ else:
     logger.info("Slack bot integration disabled (SLACK_BOT_TOKEN/SLACK_SIGNING_SECRET not set)")
 
 
+# Image URLs for help screenshots
+TAX_ID_HELP_IMG = f"{STATIC_BASE_URL}/tax-id-field.png"
+NOTES_HELP_IMG = f"{STATIC_BASE_URL}/notes-section.png"
+
+# Bold the action verb + main subject of a fix, stopping at the first detail
+_FIX_BOLD_PATTERN = re.compile(
+    r"^(.+?(?:number|date|amount|currency|description|name|address|phone|email|birth|tax identification number|Tax ID))\b(.*)$",
+    re.IGNORECASE,
+)
+
+
+def _format_fix(number: int, issue: dict) -> str:
+    """Format one numbered fix for the Copilot logs, with help image links where relevant."""
+    fix_text = issue["fix"]
+
+    # Split fix into bold action + details
+    bold_match = _FIX_BOLD_PATTERN.match(fix_text)
+    if bold_match:
+        bold_part = bold_match.group(1).strip()
+        rest_part = bold_match.group(2).strip()
+        line = f"  {number}.  **{bold_part}** {rest_part}" if rest_part else f"  {number}.  **{bold_part}**"
+    else:
+        line = f"  {number}.  **{fix_text}**"
+
+    # Add help image links for tax ID and birthday
+    req = issue["requirement"]
+    if "tax" in req:
+        return (
+            f"{line}\n\n"
+            f"       [📸 See where to add Tax ID]({TAX_ID_HELP_IMG})\n"
+            f"       Can't find it? [📸 Add it in the Notes section instead]({NOTES_HELP_IMG})"
+        )
+    if "birth" in req:
+        return f"{line}\n\n       [📸 See where to add this]({NOTES_HELP_IMG})"
+    return line
+
+
+# Shared HTTP client for downloading contentUrl attachments - reuses
+# connections (HTTP/2 where supported) instead of a new handshake per request.
+_http_client = None
+
+
+def _get_http_client():
+    """Return the shared httpx.AsyncClient, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _http_client
+
+
+@app.on_event("startup")
+async def _prewarm():
+    """Pay one-time initialization costs at startup instead of on the first request."""
+    await run_in_threadpool(warm_up_pdf_parser)
+    start_page_pool()
+    _get_http_client()
+    if os.getenv("ANTHROPIC_API_KEY"):
+        # Build the Claude client (httpx pool, SSL context) before the first request
+        get_client()
+    for invoice_type in INVOICE_TYPE_BY_VALUE:
+        _requirements_json(invoice_type)
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    """Close the shared HTTP clients' pooled connections, the shared browser and the page pool."""
+    if _http_client is not None:
+        await _http_client.aclose()
+    await close_client()
+    # Only loaded once a URL has been rendered (or by the Slack bot)
+    url_to_pdf = sys.modules.get("services.url_to_pdf")
+    if url_to_pdf is not None:
+        await url_to_pdf.close_browser()
+    slack_bot_app = sys.modules.get("slack_bot.app")
+    if slack_bot_app is not None:
+        await slack_bot_app.close_http_client()
+    await run_in_threadpool(shutdown_page_pool)
+
+
+# Uploads are read in chunks of this size and hashed as they stream in
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Accepted upload file extensions (a tuple so it can be passed to str.endswith)
+ALLOWED_EXTENSIONS = (".pdf",)
+INVALID_FILE_TYPE_DETAIL = f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+
+
+def _parse_type_and_language(invoice_type: str, language: str) -> tuple[InvoiceType, Language]:
+    """Resolve the invoice type and language parameters, raising 400 for unknown values."""
+    validated_type = INVOICE_TYPE_BY_VALUE.get(invoice_type)
+    if validated_type is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid invoice type. Must be 'paypal' or 'bank_transfer'"
+        )
+
+    validated_language = LANGUAGE_BY_VALUE.get(language)
+    if validated_language is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid language. Must be 'da' or 'en'"
+        )
+    return validated_type, validated_language
+
+
+def _check_content_length(headers: Mapping[str, str], max_bytes: int) -> None:
+    """Raise 413 when a declared Content-Length exceeds max_bytes, before anything is read."""
+    content_length = headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=FILE_TOO_LARGE_DETAIL)
+
+
+async def _read_capped(chunks: AsyncIterator[bytes], max_bytes: int) -> bytearray:
+    """
+    Read a stream of chunks into one buffer, raising 413 as soon as it exceeds max_bytes.
+
+    Appending to a bytearray keeps a single copy of the body, where collecting
+    the chunks and joining them would briefly hold two.
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        if len(buffer) + len(chunk) > max_bytes:
+            raise HTTPException(status_code=413, detail=FILE_TOO_LARGE_DETAIL)
+        buffer += chunk
+    return buffer
+
+
+async def _read_body(request: Request, max_bytes: int) -> bytearray:
+    """Read the request body, rejecting it with 413 once it exceeds max_bytes."""
+    _check_content_length(request.headers, max_bytes)
+    return await _read_capped(request.stream(), max_bytes)
+
+
+async def _read_upload(file: UploadFile) -> tuple[bytearray, str]:
+    """
+    Read an uploaded file into a single buffer, computing its SHA-256 on the way.
+
+    Hashing each chunk while it is still hot in cache avoids a second full pass
+    over the PDF to build the result cache key.
+    """
+    hasher = hashlib.sha256()
+
+    async def hashed_chunks():
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            yield chunk
+
+    content = await _read_capped(hashed_chunks(), MAX_PDF_BYTES)
+    return content, hasher.hexdigest()
+
+
+async def _download_pdf(url: str) -> bytearray:
+    """Download a PDF with the shared client, aborting once it exceeds MAX_PDF_BYTES."""
+    async with _get_http_client().stream("GET", url, follow_redirects=True) as response:
+        response.raise_for_status()
+        _check_content_length(response.headers, MAX_PDF_BYTES)
+        return await _read_capped(response.aiter_bytes(), MAX_PDF_BYTES)
+
+
+# Field order of the result models, resolved once for the orjson encoder
+# missing_items is a computed property, emitted last like model_dump_json does
+_RESULT_FIELDS = (*ValidationResult.model_fields, "missing_items")
+_EXTRACTED_FIELDS = tuple(ExtractedInvoiceData.model_fields)
+
+
+def encode_validation_result(result: ValidationResult) -> bytes:
+    """
+    Encode a ValidationResult to JSON with orjson.
+
+    Produces the same document as result.model_dump_json(): the check and
+    layout rows are dataclasses and the statuses StrEnums, both of which orjson
+    serializes natively, so only the extracted_data model needs converting.
+    """
+    data = {name: getattr(result, name) for name in _RESULT_FIELDS}
+    extracted = result.extracted_data
+    if extracted is not None:
+        data["extracted_data"] = {name: getattr(extracted, name) for name in _EXTRACTED_FIELDS}
+    return orjson.dumps(data)
+
+
+def _validation_response(result: ValidationResult) -> Response:
+    """
+    Serialize a result with the precomputed orjson encoder.
+
+    Returning a Response makes FastAPI skip re-validating the result against
+    response_model and the jsonable_encoder pass; response_model is kept on the
+    route for the OpenAPI schema only.
+    """
+    return Response(content=encode_validation_result(result), media_type="application/json")
+
+
+async def _validate_pdf_content(content: bytes, invoice_type: InvoiceType, language: Language) -> ValidationResult:
+    """
+    Validate PDF bytes for the Copilot endpoints, serving repeats from the result cache.
+    """
+    # Serve duplicate submissions from the result cache
+    content_hash = await run_in_threadpool(hash_content, content)
+    cache_key = make_cache_key(content_hash, invoice_type, language)
+    result = get_cached_result(cache_key)
+
+    if result is None:
+        # Extract text from PDF
+        try:
+            invoice_text = await run_in_threadpool(extract_text_from_pdf, content)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to extract text from PDF: {str(e)}"
+            )
+
+        # Validate the invoice
+        try:
+            if invoice_text == "[IMAGE_PDF]":
+                # Convert PDF to images and use vision API
+                images = await run_in_threadpool(pdf_to_images_base64, content)
+                if not images:
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Could not convert PDF to images."
+                    )
+                result = await validate_invoice_with_image(images, invoice_type, language)
+            else:
+                # Validate with AI using text
+                result = await validate_invoice(invoice_text, invoice_type, language)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to validate invoice: {str(e)}"
+            )
+
+        cache_result(cache_key, result)
+
+    return result
+
+
+def _copilot_response(result: ValidationResult) -> dict:
+    """Transform a ValidationResult into the pass/fail + readable logs format Copilot Studio displays."""
+    # Transform result to Copilot-compatible format
+    status = "pass" if result.overall_status.value == "approved" else "fail"
+
+    # Build readable logs for Copilot Studio chat display
+    checks_by_status = {check_status: [] for check_status in CheckStatus}
+    for check in result.checks:
+        checks_by_status[check.status].append(check)
+    present_checks = checks_by_status[CheckStatus.PRESENT]
+    missing_checks = checks_by_status[CheckStatus.MISSING]
+    unclear_checks = checks_by_status[CheckStatus.UNCLEAR]
+
+    # Collect issues: each issue paired with its fix
+    issues = []
+
+    for check in missing_checks:
+        fix = check.fix_recommendation or f"Add {check.requirement.lower()} to the invoice"
+        req_lower = check.requirement.lower()
+        issues.append({
+            "icon": "❌",
+            "label": f"Missing: {check.requirement}",
+            "fix": fix,
+            "requirement": req_lower
+        })
+
+    for check in unclear_checks:
+        label = check.requirement
+        if check.found_value:
+            label += f" (found: {check.found_value})"
+        fix = check.fix_recommendation or f"Correct {check.requirement.lower()} on the invoice"
+        req_lower = check.requirement.lower()
+        issues.append({
+            "icon": "⚠️",
+            "label": f"Incorrect: {label}",
+            "fix": fix,
+            "requirement": req_lower
+        })
+
+    for warning in (result.warnings or []):
+        issues.append({
+            "icon": "⚠️",
+            "label": warning,
+            "fix": None,
+            "requirement": ""
+        })
+
+    # Build clean output
+    total_checked = len(present_checks) + len(missing_checks) + len(unclear_checks)
+    passed = len(present_checks)
+
+    if issues:
+        # Sections are separated by blank lines; fixes are numbered with a bold action + help images
+        sections = [f"✅ {passed}/{total_checked} checks passed", "🚨 Issues found:"]
+        sections.extend(f"  {issue['icon']}  {issue['label']}" for issue in issues)
+
+        fixes = [issue for issue in issues if issue["fix"]]
+        if fixes:
+            sections.append("🔧 How to fix:")
+            sections.extend(_format_fix(i, issue) for i, issue in enumerate(fixes, 1))
+
+        logs_text = "\n\n".join(sections) + "\n"
+    else:
+        logs_text = f"✅ All {total_checked} checks passed!\n\nInvoice looks good — no issues found."
+
+    # Build short summary
+    if issues:
+        summary_text = f"{len(issues)} issues found. {passed}/{total_checked} checks passed."
+    else:
+        summary_text = f"All {total_checked} checks passed."
+
+    return {
+        "status": status,
+        "logs": logs_text,
+        "summary": summary_text
+    }
+
+
+# InvoicePayload is validated straight from the body bytes with one shared
+# adapter; the JSON endpoints take the raw Request, so the body schema is
+# added to their OpenAPI docs explicitly
+_INVOICE_PAYLOAD_ADAPTER = TypeAdapter(InvoicePayload)
+_INVOICE_PAYLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": InvoicePayload.model_json_schema()}},
+    }
+}
+
+
+async def _parse_invoice_payload(request: Request) -> InvoicePayload:
+    """Parse and validate an InvoicePayload JSON body, raising FastAPI's usual 422 on errors."""
+    # Bounded read, so an oversized body is refused before it is buffered or parsed
+    body = await _read_body(request, MAX_JSON_BODY_BYTES)
+    try:
+        return _INVOICE_PAYLOAD_ADAPTER.validate_json(body)
+    except ValidationError as e:
+        errors = []
+        for error in e.errors():
+            # An invalid JSON error echoes the whole body; as bytes it is
+            # encoded the same way FastAPI reports its own body errors
+            if isinstance(error["input"], bytearray):
+                error = {**error, "input": bytes(error["input"])}
+            errors.append({**error, "loc": ("body", *error["loc"])})
+        raise RequestValidationError(errors)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -95,45 +516,32 @@ async def analyze_invoice(
     - Layout suggestions
     - Summary
     """
-    # Validate invoice type
-    try:
-        validated_type = InvoiceType(invoice_type)
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid invoice type. Must be 'paypal' or 'bank_transfer'"
-        )
+    validated_type, validated_language = _parse_type_and_language(invoice_type, language)
 
-    # Validate language
-    try:
-        validated_language = Language(language)
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid language. Must be 'da' or 'en'"
-        )
     # Validate file type
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
 
-    allowed_extensions = {".pdf"}
-    file_ext = os.path.splitext(file.filename)[1].lower()
-
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
-        )
+    if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail=INVALID_FILE_TYPE_DETAIL)
 
     # Read file content
     try:
-        content = await file.read()
+        content, content_hash = await _read_upload(file)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
 
-    # Extract text from PDF
+    # Serve duplicate uploads from the result cache
+    cache_key = make_cache_key(content_hash, validated_type, validated_language)
+    cached = get_cached_result(cache_key)
+    if cached is not None:
+        return _validation_response(cached)
+
+    # Extract text from PDF (CPU-bound, so run it off the event loop)
     try:
-        invoice_text = extract_text_from_pdf(content)
+        invoice_text = await run_in_threadpool(extract_text_from_pdf, content)
     except Exception as e:
         raise HTTPException(
             status_code=422,
@@ -144,7 +552,7 @@ async def analyze_invoice(
     if invoice_text == "[IMAGE_PDF]":
         # Convert PDF to images and use vision API
         try:
-            images = pdf_to_images_base64(content)
+            images = await run_in_threadpool(pdf_to_images_base64, content)
             if not images:
                 raise HTTPException(
                     status_code=422,
@@ -170,11 +578,12 @@ async def analyze_invoice(
                 detail=f"Failed to validate invoice: {str(e)}"
             )
 
-    return result
+    cache_result(cache_key, result)
+    return _validation_response(result)
 
 
-@app.post("/api/analyze-invoice")
-async def analyze_invoice_json(payload: InvoicePayload):
+@app.post("/api/analyze-invoice", openapi_extra=_INVOICE_PAYLOAD_OPENAPI)
+async def analyze_invoice_json(request: Request):
     """
     Analyze an invoice PDF sent as JSON with base64-encoded content.
 
@@ -190,13 +599,18 @@ async def analyze_invoice_json(payload: InvoicePayload):
     - **status**: "pass" or "fail"
     - **logs**: Detailed validation results
     """
+    payload = await _parse_invoice_payload(request)
+
     # Get PDF content from either contentBytes or contentUrl
     content = b""
 
     if payload.contentBytes:
+        if len(payload.contentBytes) > MAX_BASE64_CHARS:
+            raise HTTPException(status_code=413, detail=FILE_TOO_LARGE_DETAIL)
+
         # Decode base64 content
         try:
-            content = base64.b64decode(payload.contentBytes)
+            content = await run_in_threadpool(pybase64.b64decode, payload.contentBytes)
         except Exception:
             raise HTTPException(
                 status_code=400,
@@ -206,11 +620,10 @@ async def analyze_invoice_json(payload: InvoicePayload):
     if not content and payload.contentUrl:
         # Download file from URL (e.g. Copilot Studio attachment URL)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(payload.contentUrl)
-                response.raise_for_status()
-                content = response.content
-                logger.info(f"Downloaded {len(content)} bytes from contentUrl")
+            content = await _download_pdf(payload.contentUrl)
+            logger.info("Downloaded %d bytes from contentUrl", len(content))
+        except HTTPException:
+            raise
         except httpx.HTTPStatusError as e:
             raise HTTPException(
                 status_code=400,
@@ -226,9 +639,9 @@ async def analyze_invoice_json(payload: InvoicePayload):
     if not content and payload.invoiceUrl:
         from services.url_to_pdf import fetch_pdf_from_url
         try:
-            logger.info(f"Rendering invoice URL to PDF: {payload.invoiceUrl[:100]}")
+            logger.info("Rendering invoice URL to PDF: %.100s", payload.invoiceUrl)
             content = await fetch_pdf_from_url(payload.invoiceUrl)
-            logger.info(f"Rendered PDF from URL: {len(content)} bytes")
+            logger.info("Rendered PDF from URL: %d bytes", len(content))
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
@@ -245,164 +658,54 @@ async def analyze_invoice_json(payload: InvoicePayload):
 
     # Validate file extension (skip for invoiceUrl since we generated the PDF)
     if not payload.invoiceUrl:
-        allowed_extensions = {".pdf"}
-        file_ext = os.path.splitext(payload.name)[1].lower() if payload.name else ""
+        if not payload.name.lower().endswith(ALLOWED_EXTENSIONS):
+            raise HTTPException(status_code=400, detail=INVALID_FILE_TYPE_DETAIL)
 
-        if file_ext not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
-            )
+    result = await _validate_pdf_content(
+        content, INVOICE_TYPE_BY_VALUE[payload.invoice_type], LANGUAGE_BY_VALUE[payload.language]
+    )
+    return _copilot_response(result)
 
-    # Extract text from PDF
-    try:
-        invoice_text = extract_text_from_pdf(content)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to extract text from PDF: {str(e)}"
-        )
-
-    # Validate the invoice
-    try:
-        if invoice_text == "[IMAGE_PDF]":
-            # Convert PDF to images and use vision API
-            images = pdf_to_images_base64(content)
-            if not images:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Could not convert PDF to images."
-                )
-            result = await validate_invoice_with_image(images, payload.invoice_type, payload.language)
-        else:
-            # Validate with AI using text
-            result = await validate_invoice(invoice_text, payload.invoice_type, payload.language)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to validate invoice: {str(e)}"
-        )
 
-    # Transform result to Copilot-compatible format
-    status = "pass" if result.overall_status.value == "approved" else "fail"
-
-    # Build readable logs for Copilot Studio chat display
-    present_checks = [c for c in result.checks if c.status.value == "present"]
-    missing_checks = [c for c in result.checks if c.status.value == "missing"]
-    unclear_checks = [c for c in result.checks if c.status.value == "unclear"]
-
-    # Image URLs for help screenshots
-    tax_id_img = f"{STATIC_BASE_URL}/tax-id-field.png"
-    notes_img = f"{STATIC_BASE_URL}/notes-section.png"
-
-    # Collect issues: each issue paired with its fix
-    issues = []
-
-    for check in missing_checks:
-        fix = check.fix_recommendation or f"Add {check.requirement.lower()} to the invoice"
-        req_lower = check.requirement.lower()
-        issues.append({
-            "icon": "❌",
-            "label": f"Missing: {check.requirement}",
-            "fix": fix,
-            "requirement": req_lower
-        })
+@app.post("/api/analyze-invoice/raw")
+async def analyze_invoice_raw(
+    request: Request,
+    invoice_type: str = "paypal",
+    language: str = "en"
+):
+    """
+    Analyze an invoice PDF sent as the raw request body (Content-Type: application/pdf).
 
-    for check in unclear_checks:
-        label = check.requirement
-        if check.found_value:
-            label += f" (found: {check.found_value})"
-        fix = check.fix_recommendation or f"Correct {check.requirement.lower()} on the invoice"
-        req_lower = check.requirement.lower()
-        issues.append({
-            "icon": "⚠️",
-            "label": f"Incorrect: {label}",
-            "fix": fix,
-            "requirement": req_lower
-        })
+    Same response as /api/analyze-invoice, for callers that can send binary
+    content - it skips the base64 encoding overhead and the decode step.
 
-    for warning in (result.warnings or []):
-        issues.append({
-            "icon": "⚠️",
-            "label": warning,
-            "fix": None,
-            "requirement": ""
-        })
-
-    # Build clean output
-    total_checked = len(present_checks) + len(missing_checks) + len(unclear_checks)
-    passed = len(present_checks)
+    - **invoice_type** (query): Type of invoice ("paypal" or "bank_transfer")
+    - **language** (query): Response language ("da" or "en")
+    """
+    validated_type, validated_language = _parse_type_and_language(invoice_type, language)
+    content = await _read_body(request, MAX_PDF_BYTES)
 
-    if issues:
-        parts = []
-        parts.append(f"✅ {passed}/{total_checked} checks passed")
-        parts.append("")
-
-        # Issues section
-        parts.append(f"🚨 Issues found:")
-        parts.append("")
-        for issue in issues:
-            parts.append(f"  {issue['icon']}  {issue['label']}")
-            parts.append("")
-
-        # Fixes section - numbered with bold action + help images
-        fixes = [issue for issue in issues if issue["fix"]]
-        if fixes:
-            parts.append(f"🔧 How to fix:")
-            parts.append("")
-            for i, issue in enumerate(fixes, 1):
-                fix_text = issue["fix"]
-
-                # Split fix into bold action + details
-                # Bold the action verb + main subject, stop at first detail
-                bold_match = re.match(r"^(.+?(?:number|date|amount|currency|description|name|address|phone|email|birth|tax identification number|Tax ID))\b(.*)$", fix_text, re.IGNORECASE)
-                if bold_match:
-                    bold_part = bold_match.group(1).strip()
-                    rest_part = bold_match.group(2).strip()
-                    if rest_part:
-                        parts.append(f"  {i}.  **{bold_part}** {rest_part}")
-                    else:
-                        parts.append(f"  {i}.  **{bold_part}**")
-                else:
-                    parts.append(f"  {i}.  **{fix_text}**")
-                parts.append("")
-
-                # Add help image links for tax ID and birthday
-                req = issue["requirement"]
-                if "tax" in req or "tax number" in req or "tax id" in req:
-                    parts.append(f"       [📸 See where to add Tax ID]({tax_id_img})")
-                    parts.append(f"       Can't find it? [📸 Add it in the Notes section instead]({notes_img})")
-                    parts.append("")
-                elif "birth" in req or "date of birth" in req or "birthday" in req:
-                    parts.append(f"       [📸 See where to add this]({notes_img})")
-                    parts.append("")
-
-        logs_text = "\n".join(parts)
-    else:
-        logs_text = f"✅ All {total_checked} checks passed!\n\nInvoice looks good — no issues found."
+    if not content:
+        raise HTTPException(status_code=400, detail="No file content provided")
 
-    # Build short summary
-    if issues:
-        summary_text = f"{len(issues)} issues found. {passed}/{total_checked} checks passed."
-    else:
-        summary_text = f"All {total_checked} checks passed."
+    # No filename to check, so look for the PDF header instead
+    if b"%PDF" not in content[:1024]:
+        raise HTTPException(status_code=400, detail=INVALID_FILE_TYPE_DETAIL)
 
-    return {
-        "status": status,
-        "logs": logs_text,
-        "summary": summary_text
-    }
+    result = await _validate_pdf_content(content, validated_type, validated_language)
+    return _copilot_response(result)
 
 
-@app.post("/api/test-connection")
-async def test_connection(payload: InvoicePayload):
+@app.post("/api/test-connection", openapi_extra=_INVOICE_PAYLOAD_OPENAPI)
+async def test_connection(request: Request):
     """
     Debug endpoint to test connectivity from Power Automate.
     Returns info about what was received without calling AI.
     """
-    return {
+    payload = await _parse_invoice_payload(request)
+
+    # Returned as a ready-made response so FastAPI skips jsonable_encoder
+    return ORJSONResponse({
         "status": "ok",
         "received": {
             "has_contentBytes": bool(payload.contentBytes),
@@ -412,24 +715,45 @@ async def test_connection(payload: InvoicePayload):
             "has_invoiceUrl": bool(payload.invoiceUrl),
             "invoiceUrl": payload.invoiceUrl[:100] if payload.invoiceUrl else None,
             "name": payload.name,
-            "invoice_type": payload.invoice_type.value,
-            "language": payload.language.value,
+            "invoice_type": payload.invoice_type,
+            "language": payload.language,
         }
-    }
+    })
+
+
+@lru_cache(maxsize=4)
+def _requirements_json(invoice_type: str) -> tuple[bytes, str]:
+    """Serialized requirements for an invoice type and the matching ETag (computed once)."""
+    body = orjson.dumps(get_requirements_for_type(invoice_type))
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return body, etag
 
 
 @app.get("/api/requirements")
-async def get_requirements(invoice_type: str = "paypal"):
+async def get_requirements(request: Request, invoice_type: str = "paypal"):
     """Get the list of invoice requirements for a specific type."""
-    from services.requirements import get_requirements_for_type
-    if invoice_type not in ["paypal", "bank_transfer"]:
+    if invoice_type not in INVOICE_TYPE_BY_VALUE:
         raise HTTPException(
             status_code=400,
             detail="Invalid invoice type. Must be 'paypal' or 'bank_transfer'"
         )
-    return get_requirements_for_type(invoice_type)
+    body, etag = _requirements_json(invoice_type)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker unless WEB_CONCURRENCY opts into more: the Slack PDF cache, the
+    # result cache and the channel write pacing live in process memory, so a
+    # Slack button click has to reach the process that saw the file. With more
+    # workers, each sizes its PDF page pool to its share of the CPUs.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY") or 1),
+    )
@@ -1,3 +1,3 @@
-from .schemas import ValidationResult, CheckResult, CheckStatus, OverallStatus, InvoiceType, AnalyzeRequest, Language, LayoutSuggestion
+from .schemas import ValidationResult, CheckResult, CheckStatus, OverallStatus, InvoiceType, Language, LayoutSuggestion
 
-__all__ = ["ValidationResult", "CheckResult", "CheckStatus", "OverallStatus", "InvoiceType", "AnalyzeRequest", "Language", "LayoutSuggestion"]
+__all__ = ["ValidationResult", "CheckResult", "CheckStatus", "OverallStatus", "InvoiceType", "Language", "LayoutSuggestion"]
@@ -1,31 +1,53 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, computed_field
 from typing import Literal, Optional, List
-from enum import Enum
+from enum import StrEnum
 
 
-class InvoiceType(str, Enum):
+# Shared by all schemas: they are transient request/response DTOs that are never
+# mutated, and building their core schema is deferred until first use
+SCHEMA_CONFIG = ConfigDict(frozen=True, extra="ignore", validate_assignment=False, defer_build=True)
+
+
+class InvoiceType(StrEnum):
     PAYPAL = "paypal"
     BANK_TRANSFER = "bank_transfer"
 
 
-class Language(str, Enum):
+class Language(StrEnum):
     DANISH = "da"
     ENGLISH = "en"
 
 
-class CheckStatus(str, Enum):
+class CheckStatus(StrEnum):
     PRESENT = "present"
     MISSING = "missing"
     UNCLEAR = "unclear"
 
 
-class OverallStatus(str, Enum):
+class OverallStatus(StrEnum):
     APPROVED = "approved"
     MISSING_INFORMATION = "missing_information"
     INVALID = "invalid"
 
 
-class CheckResult(BaseModel):
+# Value -> member lookups for parsing raw strings without Enum.__call__
+INVOICE_TYPE_BY_VALUE = {member.value: member for member in InvoiceType}
+LANGUAGE_BY_VALUE = {member.value: member for member in Language}
+CHECK_STATUS_BY_VALUE = {member.value: member for member in CheckStatus}
+OVERALL_STATUS_BY_VALUE = {member.value: member for member in OverallStatus}
+
+# Plain-string forms of the enums for request models - pydantic-core checks a
+# Literal with a single set lookup instead of running the Enum validator.
+# Map back to the enum members with the *_BY_VALUE dicts.
+InvoiceTypeValue = Literal["paypal", "bank_transfer"]
+LanguageValue = Literal["da", "en"]
+
+
+# The per-check result rows are plain slotted dataclasses: there can be dozens
+# per response, and pydantic still validates/serializes them as nested fields
+@dataclass(slots=True, frozen=True, kw_only=True)
+class CheckResult:
     requirement: str
     status: CheckStatus
     found_value: Optional[str] = None
@@ -33,7 +55,8 @@ class CheckResult(BaseModel):
     fix_recommendation: Optional[str] = None
 
 
-class LayoutSuggestion(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class LayoutSuggestion:
     section: str
     issue: str
     suggestion: str
@@ -41,6 +64,8 @@ class LayoutSuggestion(BaseModel):
 
 class ExtractedInvoiceData(BaseModel):
     """Structured data extracted from the invoice for preview display."""
+    model_config = SCHEMA_CONFIG
+
     # Sender info
     sender_name: Optional[str] = None
     sender_address: Optional[str] = None
@@ -80,25 +105,32 @@ class ExtractedInvoiceData(BaseModel):
 
 
 class ValidationResult(BaseModel):
+    model_config = SCHEMA_CONFIG
+
     overall_status: OverallStatus
     invoice_type: InvoiceType
     checks: List[CheckResult]
-    missing_items: List[str]
     warnings: List[str]
     layout_suggestions: List[LayoutSuggestion]
     summary: str
     extracted_data: Optional[ExtractedInvoiceData] = None
 
-
-class AnalyzeRequest(BaseModel):
-    invoice_type: InvoiceType = InvoiceType.PAYPAL
+    # Derived from checks rather than stored alongside them; still emitted in
+    # the JSON output for the frontend's issues list. Covers missing and
+    # unclear (invalid) checks alike, as the prompts used to define it
+    @computed_field
+    @property
+    def missing_items(self) -> List[str]:
+        return [c.requirement for c in self.checks if c.status is not CheckStatus.PRESENT]
 
 
 class InvoicePayload(BaseModel):
     """Payload for Copilot Agent Flow JSON file transfer."""
+    model_config = SCHEMA_CONFIG
+
     contentBytes: str = ""  # Base64-encoded PDF content (optional if contentUrl is provided)
     contentUrl: Optional[str] = None  # URL to download the PDF from (e.g. Copilot Studio attachment URL)
     invoiceUrl: Optional[str] = None  # PayPal invoice URL - will be rendered to PDF via Playwright
     name: str = "invoice.pdf"  # Filename
-    invoice_type: InvoiceType = InvoiceType.PAYPAL
-    language: Language = Language.ENGLISH
+    invoice_type: InvoiceTypeValue = "paypal"
+    language: LanguageValue = "en"
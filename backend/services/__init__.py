@@ -1,5 +1,20 @@
-from .pdf_parser import extract_text_from_pdf
-from .requirements import INVOICE_REQUIREMENTS
-from .ai_validator import validate_invoice
+import importlib
+
+# Re-exports are resolved lazily (PEP 562) so importing one submodule, e.g.
+# services.pdf_parser, does not pull in the Anthropic SDK via ai_validator
+_LAZY_EXPORTS = {
+    "extract_text_from_pdf": ".pdf_parser",
+    "INVOICE_REQUIREMENTS": ".requirements",
+    "validate_invoice": ".ai_validator",
+}
 
 __all__ = ["extract_text_from_pdf", "INVOICE_REQUIREMENTS", "validate_invoice"]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,490 +1,150 @@
-import json
 import os
+import sys
 from pathlib import Path
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+import httpx
 from dotenv import load_dotenv
-from models.schemas import ValidationResult, CheckResult, CheckStatus, OverallStatus, InvoiceType, Language, LayoutSuggestion, ExtractedInvoiceData
-from .requirements import get_requirements_as_text
-
-# Ensure .env is loaded
-env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
-
-
-# Ideal PayPal invoice layout description
-IDEAL_PAYPAL_LAYOUT = """
-## IDEELT PAYPAL FAKTURA LAYOUT
-
-En korrekt PayPal faktura skal have følgende struktur og sektioner:
-
-### 1. HEADER (Øverst til højre)
-- Titel: "FAKTURERING"
-- Afsenders fulde navn (f.eks. "Linus Nordin")
-- Komplet adresse med land (f.eks. "Vikingavägen, 194 68 UPPLANDS VÄSBY, SVERIGE")
-- Telefonnummer
-- Email-adresse
-
-### 2. FAKTURAOPLYSNINGER (Venstre side)
-- Faktura-nr.: [nummer]
-- Fakturadato: [dato]
-- Forfaldsdato: [dato]
-- Valgfrit: QR-kode til betaling
-
-### 3. MODTAGER SEKTION
-- Overskrift: "SEND FAKTURA TIL"
-- Email: info@thelabelsunday.com
-
-### 4. LINJEPOSTER TABEL
-- Kolonnehoveder: Nr., VARER OG BESKRIVELSE, ANTAL/TIMER, PRIS, BELØB
-- Tydelig beskrivelse af ydelsen (f.eks. "Tiktok promotion / 2 videos")
-- Subtotal
-- SAMLET PRIS med valuta
-
-### 5. BEMÆRKNINGER TIL KUNDEN (Valgfri sektion)
-Denne sektion KAN indeholde (men er ikke påkrævet):
-- Modtagers firmaoplysninger (The Label Sunday, adresse, email)
-- Creator/Kunstner information med kunstnernavn i parentes (f.eks. "Creator: Linus Nordin (testosteronexxtren)")
-- Fødselsdato (f.eks. "Date of birth: 2007-09-07")
-- Skattenummer med landekode (f.eks. "Personal tax number (SE): 070907-2672")
-- Momsstatus (f.eks. "Not VAT registered.")
-
-### LAYOUT KRAV
-- Professionelt og rent design
-- Tydelig sektionsopdeling
-- Konsistent typografi
-- QR-kode anbefales men er ikke påkrævet
-"""
-
-
-def get_validation_prompt(invoice_text: str, invoice_type: InvoiceType, language: Language) -> str:
-    """Generate the validation prompt for Claude based on invoice type and language."""
-    requirements_text = get_requirements_as_text(invoice_type.value)
-
-    if invoice_type == InvoiceType.PAYPAL:
-        # PayPal invoice - no layout validation
-        if language == Language.DANISH:
-            return f"""Du er en fakturavalidator for The Label Sunday ApS.
-
-Du skal analysere den uploadede faktura og verificere om den opfylder alle krav for en **PayPal**-faktura.
-
-VIGTIGE REGLER:
-- Gæt IKKE på manglende information
-- Basér din vurdering UDELUKKENDE på den angivne fakturatekst
-- Hvis noget ikke er tydeligt angivet, markér det som "missing" eller "unclear"
-- Vær striks men fair i din vurdering
-- Alle tekster skal være på DANSK
-- VIGTIGT: Skattenummer/TIN kan være angivet på flere måder: "skattenummer", "tax number", "TIN", "CPR", "personnummer", "personal tax number", "social security number" osv. Alle disse opfylder kravet om skattenummer.
-- VIGTIGT: Fremtidige datoer er acceptable - flager IKKE fakturadatoer i fremtiden som problemer.
-
-## KENDTE KORREKTE VÆRDIER FOR THE LABEL SUNDAY
-Brug disse PRÆCISE værdier i fix_recommendation når det relaterede felt mangler eller er forkert:
-- Firmanavn: "The Label Sunday ApS"
-- Adresse: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## VIGTIGT: RETTELSESANBEFALINGER
-For HVERT tjek der er "missing" eller "unclear", SKAL du give en specifik, handlingsrettet fix_recommendation der fortæller brugeren PRÆCIS hvad de skal skrive og hvor.
-- For felter relateret til The Label Sunday (modtager/køber): Inkludér ALTID de korrekte værdier fra listen ovenfor.
-- For felter relateret til afsender/creator: Fortæl dem det forventede format med et eksempel.
-- Hvis en værdi er til stede men STAVET FORKERT eller FORKERT, fortæl brugeren den præcise korrekte stavning/værdi.
-
-Eksempler på GODE fix_recommendation:
-- "Modtagerens firmanavn mangler. Tilføj 'The Label Sunday ApS' i 'Send faktura til' sektionen."
-- "Modtagerens adresse er stavet forkert. Den korrekte adresse er: 'Vognmagergade 7, 6., 1120 Copenhagen K, Denmark'"
-- "Tilføj din fødselsdato i bemærkninger, format: 'Fødselsdato: ÅÅÅÅ-MM-DD'"
-- "Tilføj dit fulde skattenummer med landekode i bemærkninger, format: 'Skattenummer (XX): [dit fulde skattenummer]'"
-
-Eksempler på DÅRLIGE fix_recommendation (for vage - GØR IKKE DETTE):
-- "Tilføj venligst modtagers firma på fakturaen."
-- "Ret eller tydeliggør skattenummeret."
-
-## PÅKRÆVET OUTPUT FORMAT (KUN JSON)
-
-Du SKAL svare med UDELUKKENDE valid JSON i dette præcise format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Navn på kravet",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "Værdien fundet i fakturaen, eller null hvis ikke fundet",
-      "comment": "Kort forklaring på dansk",
-      "fix_recommendation": "Specifik instruktion med korrekte værdier. For Label Sunday felter brug de kendte korrekte værdier. For afsender felter vis det forventede format. null hvis status er present."
-    }}
-  ],
-  "missing_items": ["Liste over manglende eller ugyldige felter"],
-  "warnings": ["Liste over uklare eller potentielt problematiske elementer"],
-  "layout_suggestions": [],
-  "summary": "En kort menneskelæselig konklusion på dansk",
-  "extracted_data": {{
-    "sender_name": "Afsenders fulde navn eller null",
-    "sender_address": "Afsenders adresse eller null",
-    "sender_email": "Afsenders email eller null",
-    "sender_phone": "Afsenders telefon eller null",
-    "invoice_number": "Fakturanummer eller null",
-    "invoice_date": "Fakturadato eller null",
-    "due_date": "Forfaldsdato eller null",
-    "recipient_email": "Modtagers email eller null",
-    "recipient_company": "Modtagers firmanavn eller null",
-    "recipient_address": "Modtagers adresse eller null",
-    "service_description": "Beskrivelse af ydelsen eller null",
-    "quantity": "Antal eller null",
-    "unit_price": "Enhedspris eller null",
-    "total_amount": "Totalbeløb eller null",
-    "currency": "Valuta (f.eks. EUR, DKK) eller null",
-    "creator_name": "Creator/kunstner navn eller null",
-    "artist_name": "Kunstnernavn/handle i parentes eller null",
-    "birth_date": "Fødselsdato eller null",
-    "tax_number": "Skattenummer uden landekode eller null",
-    "tax_country": "Landekode for skat (f.eks. SE, DK) eller null",
-    "vat_status": "Momsstatus eller null"
-  }}
-}}
-
-## STATUS DEFINITIONER
-- "approved": Alle påkrævede felter er til stede og gyldige
-- "missing_information": Nogle påkrævede felter mangler, men fakturaen er ellers gyldig
-- "invalid": Kritiske problemer fundet (forkert køber, inkonsistente data, etc.)
-
-## FAKTURAKRAV DER SKAL TJEKKES
-
-{requirements_text}
-
-## FAKTURATEKST TIL ANALYSE
-
-{invoice_text}
-
----
-
-Analysér nu fakturaen og svar med UDELUKKENDE JSON-resultatet. Inkludér ingen tekst før eller efter JSON."""
-
-        else:  # English
-            return f"""You are an invoice validator for The Label Sunday ApS.
-
-You need to analyze the uploaded invoice and verify if it meets all requirements for a **PayPal** invoice.
-
-IMPORTANT RULES:
-- Do NOT guess missing information
-- Base your evaluation STRICTLY on the provided invoice text
-- If something is not clearly stated, mark it as "missing" or "unclear"
-- Be strict but fair in your evaluation
-- All text responses must be in ENGLISH
-- IMPORTANT: Tax number/TIN can be indicated in various ways: "skattenummer", "tax number", "TIN", "CPR", "personnummer", "personal tax number", "social security number", etc. All of these fulfill the tax number requirement.
-- IMPORTANT: Future dates are acceptable - do NOT flag invoice dates in the future as issues.
-
-## KNOWN CORRECT VALUES FOR THE LABEL SUNDAY
-Use these EXACT values in fix_recommendation when the related field is missing or incorrect:
-- Company name: "The Label Sunday ApS"
-- Address: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## CRITICAL: FIX RECOMMENDATIONS
-For EVERY check that is "missing" or "unclear", you MUST provide a specific, actionable fix_recommendation that tells the creator EXACTLY what to write and where.
-- For fields related to The Label Sunday (recipient/buyer): ALWAYS include the correct values from the list above.
-- For fields related to the sender/creator: tell them what format is expected, with a placeholder example.
-- If a value is present but MISSPELLED or INCORRECT, tell the user the exact correct spelling/value.
-
-Examples of GOOD fix_recommendation:
-- "The recipient company name is missing. Add 'The Label Sunday ApS' in the 'Bill To' or 'Send Invoice To' section."
-- "The recipient address is misspelled. The correct address is: 'Vognmagergade 7, 6., 1120 Copenhagen K, Denmark'"
-- "Add your date of birth in the Notes section, format: 'Date of birth: YYYY-MM-DD'"
-- "Add your full tax identification number with country code in the Notes section, format: 'Personal tax number (XX): [your full tax number]'"
-- "The recipient email should be 'info@thelabelsunday.com' in the 'Send Invoice To' field."
-- "Add a clear description of the work performed, e.g.: 'TikTok promotion / 2 videos for @brandname'"
-
-Examples of BAD fix_recommendation (too vague - DO NOT do this):
-- "Please add recipient company to the invoice."
-- "Please correct or clarify the tax number."
-- "Add the missing information."
-
-## REQUIRED OUTPUT FORMAT (JSON ONLY)
-
-You MUST respond with ONLY valid JSON in this exact format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Name of the requirement",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "The value found in the invoice, or null if not found",
-      "comment": "Brief explanation in English",
-      "fix_recommendation": "Specific, actionable instruction with exact correct values. For Label Sunday fields use the known correct values. For sender fields show the expected format. null if status is present."
-    }}
-  ],
-  "missing_items": ["List of missing or invalid fields"],
-  "warnings": ["List of unclear or potentially problematic items"],
-  "layout_suggestions": [],
-  "summary": "A short human-readable conclusion in English",
-  "extracted_data": {{
-    "sender_name": "Sender's full name or null",
-    "sender_address": "Sender's address or null",
-    "sender_email": "Sender's email or null",
-    "sender_phone": "Sender's phone or null",
-    "invoice_number": "Invoice number or null",
-    "invoice_date": "Invoice date or null",
-    "due_date": "Due date or null",
-    "recipient_email": "Recipient's email or null",
-    "recipient_company": "Recipient's company name or null",
-    "recipient_address": "Recipient's address or null",
-    "service_description": "Description of service or null",
-    "quantity": "Quantity or null",
-    "unit_price": "Unit price or null",
-    "total_amount": "Total amount or null",
-    "currency": "Currency (e.g. EUR, DKK) or null",
-    "creator_name": "Creator/artist name or null",
-    "artist_name": "Artist name/handle in parentheses or null",
-    "birth_date": "Date of birth or null",
-    "tax_number": "Tax number without country code or null",
-    "tax_country": "Tax country code (e.g. SE, DK) or null",
-    "vat_status": "VAT status or null"
-  }}
-}}
-
-## STATUS DEFINITIONS
-- "approved": All mandatory fields are present and valid
-- "missing_information": Some required fields are missing but invoice is otherwise valid
-- "invalid": Critical issues found (wrong buyer, inconsistent data, etc.)
-
-## INVOICE REQUIREMENTS TO CHECK
-
-{requirements_text}
-
-## INVOICE TEXT TO ANALYZE
-
-{invoice_text}
-
----
-
-Now analyze the invoice and respond with ONLY the JSON result. Do not include any text before or after the JSON."""
-
-    else:
-        # Bank transfer invoice - no layout validation
-        if language == Language.DANISH:
-            return f"""Du er en fakturavalidator for The Label Sunday ApS.
-
-Du skal analysere den uploadede faktura/betalingsanmodning og verificere om den opfylder alle krav for en **Bankoverførsel**.
-
-## VIGTIG KONTEKST FOR BANKOVERFØRSLER
-For bankoverførsler er betalingsmodtageren (den person der skal have pengene) OGSÅ fakturaafsenderen.
-Der er INGEN separat "afsender/seller" information påkrævet - betalingsmodtagerens oplysninger erstatter dette.
-
-## PÅKRÆVEDE FELTER FOR BANKOVERFØRSEL
-1. **Dato** - En dato for dokumentet (kan være "Date", "Dato", "Payment Request Date" eller lignende)
-2. **Beskrivelse af ydelse** - Hvad der betales for
-3. **Beløb og valuta** - Totalbeløb med valuta
-4. **Modtager (Sunday)** - The Label Sunday's navn og adresse
-5. **Betalingsmodtager info** - Følgende felter skal tjekkes SEPARAT:
-   - Navn (fulde navn)
-   - Adresse (gadeadresse) - tjek som SEPARAT felt
-   - Postnummer + by - tjek som SEPARAT felt
-   - Land
-   - Fødselsdato (for udlændinge)
-   - TIN/skattenummer
-6. **Bankoplysninger** - Banknavn, kontonummer/IBAN, SWIFT/BIC
-
-## IKKE PÅKRÆVET FOR BANKOVERFØRSEL
-- Fakturanummer (nice to have, men ikke påkrævet)
-- Forfaldsdato (nice to have, men ikke påkrævet)
-- Separat afsender/seller info (betalingsmodtageren ER afsenderen)
-- Telefonnummer og email (nice to have, men ikke påkrævet)
-
-VIGTIGE REGLER:
-- Gæt IKKE på manglende information
-- Basér din vurdering UDELUKKENDE på den angivne fakturatekst
-- Vær fair i din vurdering - hvis alle PÅKRÆVEDE felter er til stede, skal status være "approved"
-- Alle tekster skal være på DANSK
-- VIGTIGT: Adresse og Postnummer+by er TO SEPARATE felter. Hvis et af dem mangler, skal det rapporteres som et separat manglende felt i missing_items og checks.
-
-## KENDTE KORREKTE VÆRDIER FOR THE LABEL SUNDAY
-Brug disse PRÆCISE værdier i fix_recommendation når det relaterede felt mangler eller er forkert:
-- Firmanavn: "The Label Sunday ApS"
-- Adresse: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## VIGTIGT: RETTELSESANBEFALINGER
-For HVERT tjek der er "missing" eller "unclear", SKAL du give en specifik, handlingsrettet fix_recommendation.
-- For felter relateret til The Label Sunday (modtager/køber): Inkludér ALTID de korrekte værdier fra listen ovenfor.
-- For felter relateret til betalingsmodtager/afsender: Fortæl dem det forventede format.
-- Hvis en værdi er STAVET FORKERT, fortæl brugeren den præcise korrekte stavning.
-
-## PÅKRÆVET OUTPUT FORMAT (KUN JSON)
-
-Du SKAL svare med UDELUKKENDE valid JSON i dette præcise format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Navn på kravet",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "Værdien fundet i fakturaen, eller null hvis ikke fundet",
-      "comment": "Kort forklaring på dansk",
-      "fix_recommendation": "Specifik instruktion med korrekte værdier. For Label Sunday felter brug de kendte korrekte værdier. null hvis status er present."
-    }}
-  ],
-  "missing_items": ["Liste over manglende PÅKRÆVEDE felter - ignorer valgfrie felter"],
-  "warnings": ["Liste over uklare eller potentielt problematiske elementer"],
-  "layout_suggestions": [],
-  "summary": "En kort menneskelæselig konklusion på dansk"
-}}
-
-## STATUS DEFINITIONER
-- "approved": Alle PÅKRÆVEDE felter er til stede og gyldige (ignorer valgfrie felter som fakturanummer, forfaldsdato, telefon, email)
-- "missing_information": Nogle PÅKRÆVEDE felter mangler (dato, beløb, beskrivelse, Sunday info, betalingsmodtager info, bankoplysninger)
-- "invalid": Kritiske problemer fundet (forkert køber, inkonsistente data, etc.)
-
-## FAKTURATEKST TIL ANALYSE
-
-{invoice_text}
-
----
-
-Analysér nu fakturaen og svar med UDELUKKENDE JSON-resultatet. Inkludér ingen tekst før eller efter JSON."""
-
-        else:  # English
-            return f"""You are an invoice validator for The Label Sunday ApS.
-
-You need to analyze the uploaded invoice/payment request and verify if it meets all requirements for a **Bank Transfer**.
-
-## IMPORTANT CONTEXT FOR BANK TRANSFERS
-For bank transfers, the payment recipient (the person receiving the money) IS ALSO the invoice sender.
-There is NO separate "sender/seller" information required - the payment recipient's info replaces this.
-
-## REQUIRED FIELDS FOR BANK TRANSFER
-1. **Date** - A date for the document (can be "Date", "Payment Request Date" or similar)
-2. **Service description** - What is being paid for
-3. **Amount and currency** - Total amount with currency
-4. **Recipient (Sunday)** - The Label Sunday's name and address
-5. **Payment recipient info** - The following fields must be checked SEPARATELY:
-   - Name (full name)
-   - Address (street address) - check as SEPARATE field
-   - Postal code + city - check as SEPARATE field
-   - Country
-   - Birth date (for foreigners)
-   - TIN/tax number
-6. **Bank details** - Bank name, account number/IBAN, SWIFT/BIC
-
-## NOT REQUIRED FOR BANK TRANSFER
-- Invoice number (nice to have, but not required)
-- Due date (nice to have, but not required)
-- Separate sender/seller info (the payment recipient IS the sender)
-- Phone number and email (nice to have, but not required)
-
-IMPORTANT RULES:
-- Do NOT guess missing information
-- Base your evaluation STRICTLY on the provided invoice text
-- Be fair in your evaluation - if all REQUIRED fields are present, status should be "approved"
-- All text responses must be in ENGLISH
-- IMPORTANT: Address and Postal code+city are TWO SEPARATE fields. If one is missing, it should be reported as a separate missing item in missing_items and checks.
-
-## KNOWN CORRECT VALUES FOR THE LABEL SUNDAY
-Use these EXACT values in fix_recommendation when the related field is missing or incorrect:
-- Company name: "The Label Sunday ApS"
-- Address: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## CRITICAL: FIX RECOMMENDATIONS
-For EVERY check that is "missing" or "unclear", you MUST provide a specific, actionable fix_recommendation.
-- For fields related to The Label Sunday (recipient/buyer): ALWAYS include the correct values from the list above.
-- For fields related to the payment recipient/sender: tell them the expected format.
-- If a value is MISSPELLED, tell the user the exact correct spelling.
-
-## REQUIRED OUTPUT FORMAT (JSON ONLY)
-
-You MUST respond with ONLY valid JSON in this exact format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Name of the requirement",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "The value found in the invoice, or null if not found",
-      "comment": "Brief explanation in English",
-      "fix_recommendation": "Specific instruction with correct values. For Label Sunday fields use the known correct values. null if status is present."
-    }}
-  ],
-  "missing_items": ["List of missing REQUIRED fields - ignore optional fields"],
-  "warnings": ["List of unclear or potentially problematic items"],
-  "layout_suggestions": [],
-  "summary": "A short human-readable conclusion in English"
-}}
-
-## STATUS DEFINITIONS
-- "approved": All REQUIRED fields are present and valid (ignore optional fields like invoice number, due date, phone, email)
-- "missing_information": Some REQUIRED fields are missing (date, amount, description, Sunday info, payment recipient info, bank details)
-- "invalid": Critical issues found (wrong buyer, inconsistent data, etc.)
-
-## INVOICE TEXT TO ANALYZE
-
-{invoice_text}
-
----
-
-Now analyze the invoice and respond with ONLY the JSON result. Do not include any text before or after the JSON."""
-
+from models.schemas import ValidationResult, CheckResult, CheckStatus, OverallStatus, InvoiceType, Language, LayoutSuggestion, ExtractedInvoiceData, CHECK_STATUS_BY_VALUE, OVERALL_STATUS_BY_VALUE
+from .prompts import VALIDATION_PROMPT_CLOSING, get_validation_prompt, get_vision_validation_prompt
+
+# Load .env when used outside the app (main.py loads it first); variables
+# already set in the environment take precedence over the file
+if not os.getenv("ANTHROPIC_API_KEY"):
+    load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env", override=False)
+
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Output caps per invoice type, with generous headroom - PayPal answers have
+# more checks plus the extracted_data block. These only cut off runaway
+# generations; a truncated answer is reported as failed and is not cached.
+MAX_TOKENS = {
+    InvoiceType.PAYPAL: 3072,
+    InvoiceType.BANK_TRANSFER: 2048,
+}
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+
+# Claude is forced to answer through this tool, so the API hands back the
+# result as already-parsed JSON instead of text that has to be searched and
+# decoded. The schema mirrors the output format described in the prompts.
+REPORT_VALIDATION_TOOL = {
+    "name": "report_validation",
+    "description": "Report the result of validating the invoice.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "overall_status": {"type": "string", "enum": [status.value for status in OverallStatus]},
+            "checks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "requirement": {"type": "string"},
+                        "status": {"type": "string", "enum": [status.value for status in CheckStatus]},
+                        "found_value": _NULLABLE_STRING,
+                        "comment": {"type": "string"},
+                        "fix_recommendation": _NULLABLE_STRING,
+                    },
+                    "required": ["requirement", "status", "comment"],
+                },
+            },
+            "warnings": {"type": "array", "items": {"type": "string"}},
+            "layout_suggestions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "section": {"type": "string"},
+                        "issue": {"type": "string"},
+                        "suggestion": {"type": "string"},
+                    },
+                    "required": ["section", "issue", "suggestion"],
+                },
+            },
+            "summary": {"type": "string"},
+            "extracted_data": {
+                "type": ["object", "null"],
+                "properties": {name: _NULLABLE_STRING for name in ExtractedInvoiceData.model_fields},
+            },
+        },
+        "required": ["overall_status", "checks", "warnings", "summary"],
+    },
+}
+TOOL_CHOICE = {"type": "tool", "name": REPORT_VALIDATION_TOOL["name"]}
+
+_client: AsyncAnthropic | None = None
+
+
+def get_client() -> AsyncAnthropic:
+    """
+    Return the shared AsyncAnthropic client, creating it on first use.
 
-async def validate_invoice(invoice_text: str, invoice_type: InvoiceType, language: Language = Language.DANISH) -> ValidationResult:
+    The async client keeps the event loop free while Claude responds, so
+    concurrent validations overlap, and reusing it keeps its connection pool.
     """
-    Validate an invoice using Claude AI.
+    global _client
+    if _client is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+        _client = AsyncAnthropic(
+            api_key=api_key,
+            max_retries=5,
+            # Keep idle connections for a minute (httpx default: 5 s) so invoices
+            # arriving a little apart reuse the TLS connection to the API, and
+            # multiplex concurrent validations over it with HTTP/2
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0),
+            ),
+        )
+    return _client
 
-    Args:
-        invoice_text: Extracted text from the invoice
-        invoice_type: Type of invoice (paypal or bank_transfer)
-        language: Language for responses (da or en)
 
-    Returns:
-        ValidationResult with all check results
-    """
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+async def close_client() -> None:
+    """Close the shared client's pooled connections, if it was created."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
 
-    client = Anthropic(api_key=api_key, max_retries=5)
 
-    prompt = get_validation_prompt(invoice_text, invoice_type, language)
+# Static prompt prefixes for every (invoice type, language), built at import
+_validation_prompts: dict[tuple[InvoiceType, Language], str] = {
+    (invoice_type, language): get_validation_prompt(invoice_type, language)
+    for invoice_type in InvoiceType
+    for language in Language
+}
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=4096,
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
 
-    # Extract the response text
-    response_text = message.content[0].text
-
-    # Parse the JSON response
-    try:
-        # Try to extract JSON from the response (in case there's extra text)
-        json_start = response_text.find("{")
-        json_end = response_text.rfind("}") + 1
-        if json_start != -1 and json_end > json_start:
-            json_str = response_text[json_start:json_end]
-            result_dict = json.loads(json_str)
-        else:
-            raise ValueError("No JSON object found in response")
-    except json.JSONDecodeError as e:
-        # If JSON parsing fails, return an error result
-        error_msg = "Der opstod en fejl ved analyse af fakturaen. Prøv igen." if language == Language.DANISH else "An error occurred while analyzing the invoice. Please try again."
-        return ValidationResult(
-            overall_status=OverallStatus.INVALID,
-            invoice_type=invoice_type,
-            checks=[],
-            missing_items=[],
-            warnings=[f"Failed to parse AI response: {str(e)}"],
-            layout_suggestions=[],
-            summary=error_msg
-        )
+def _validation_prompt_content(invoice_text: str, invoice_type: InvoiceType, language: Language) -> list[dict]:
+    """
+    Build the user message content blocks for text-based validation.
+
+    The static instructions are marked with cache_control so Anthropic caches
+    the prefix across requests; only the invoice text is processed fresh.
+    """
+    return [
+        {"type": "text", "text": _validation_prompts[(invoice_type, language)], "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": invoice_text + VALIDATION_PROMPT_CLOSING[language]},
+    ]
+
+
+def _build_validation_result(result_dict: dict, invoice_type: InvoiceType) -> ValidationResult:
+    """
+    Assemble a ValidationResult from the parsed AI response.
 
-    # Convert to Pydantic model
+    The statuses are converted to their enums explicitly and every other field
+    is plain JSON data, so the models are built with model_construct (and the
+    check/suggestion dataclasses directly) instead of running pydantic
+    validation over each nested object again.
+    """
     checks = [
         CheckResult(
-            requirement=check["requirement"],
-            status=CheckStatus(check["status"]),
+            # Requirement labels repeat across every invoice - intern them so
+            # cached results share one string object per label
+            requirement=sys.intern(check["requirement"]),
+            status=CHECK_STATUS_BY_VALUE[check["status"]],
             found_value=check.get("found_value"),
             comment=check["comment"],
             fix_recommendation=check.get("fix_recommendation")
@@ -504,13 +164,12 @@ async def validate_invoice(invoice_text: str, invoice_type: InvoiceType, languag
     # Parse extracted data if present
     extracted_data = None
     if "extracted_data" in result_dict and result_dict["extracted_data"]:
-        extracted_data = ExtractedInvoiceData(**result_dict["extracted_data"])
+        extracted_data = ExtractedInvoiceData.model_construct(**result_dict["extracted_data"])
 
-    return ValidationResult(
-        overall_status=OverallStatus(result_dict["overall_status"]),
+    return ValidationResult.model_construct(
+        overall_status=OVERALL_STATUS_BY_VALUE[result_dict["overall_status"]],
         invoice_type=invoice_type,
         checks=checks,
-        missing_items=result_dict.get("missing_items", []),
         warnings=result_dict.get("warnings", []),
         layout_suggestions=layout_suggestions,
         summary=result_dict.get("summary", ""),
@@ -518,405 +177,117 @@ async def validate_invoice(invoice_text: str, invoice_type: InvoiceType, languag
     )
 
 
-def get_vision_validation_prompt(invoice_type: InvoiceType, language: Language) -> str:
-    """Generate the validation prompt for image-based invoice analysis."""
-    requirements_text = get_requirements_as_text(invoice_type.value)
-
-    # For PayPal invoices
-    if invoice_type == InvoiceType.PAYPAL:
-        if language == Language.DANISH:
-            return f"""Du er en fakturavalidator for The Label Sunday ApS.
-
-Du skal analysere det uploadede fakturabillede og verificere om den opfylder alle krav for en **PayPal**-faktura.
-
-VIGTIGE REGLER:
-- Læs al tekst fra billedet omhyggeligt
-- Gæt IKKE på manglende information
-- Hvis noget ikke er tydeligt synligt, markér det som "missing" eller "unclear"
-- Vær striks men fair i din vurdering
-- Alle tekster skal være på DANSK
-- VIGTIGT: Skattenummer/TIN kan være angivet på flere måder: "skattenummer", "tax number", "TIN", "CPR", "personnummer", "personal tax number", "social security number" osv. Alle disse opfylder kravet om skattenummer.
-- VIGTIGT: Fremtidige datoer er acceptable - flager IKKE fakturadatoer i fremtiden som problemer.
-
-## KENDTE KORREKTE VÆRDIER FOR THE LABEL SUNDAY
-- Firmanavn: "The Label Sunday ApS"
-- Adresse: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## VIGTIGT: RETTELSESANBEFALINGER
-For HVERT tjek der er "missing" eller "unclear", giv en specifik fix_recommendation med korrekte værdier. Hvis en værdi er STAVET FORKERT, fortæl den korrekte stavning.
-
-## PÅKRÆVET OUTPUT FORMAT (KUN JSON)
-
-Du SKAL svare med UDELUKKENDE valid JSON i dette præcise format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Navn på kravet",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "Værdien fundet i fakturaen, eller null hvis ikke fundet",
-      "comment": "Kort forklaring på dansk",
-      "fix_recommendation": "Specifik instruktion med korrekte værdier. For Label Sunday felter brug de kendte korrekte værdier ovenfor. null hvis status er present."
-    }}
-  ],
-  "missing_items": ["Liste over manglende eller ugyldige felter"],
-  "warnings": ["Liste over uklare eller potentielt problematiske elementer"],
-  "layout_suggestions": [],
-  "summary": "En kort menneskelæselig konklusion på dansk",
-  "extracted_data": {{
-    "sender_name": "Afsenders fulde navn eller null",
-    "sender_address": "Afsenders adresse eller null",
-    "sender_email": "Afsenders email eller null",
-    "sender_phone": "Afsenders telefon eller null",
-    "invoice_number": "Fakturanummer eller null",
-    "invoice_date": "Fakturadato eller null",
-    "due_date": "Forfaldsdato eller null",
-    "recipient_email": "Modtagers email eller null",
-    "recipient_company": "Modtagers firmanavn eller null",
-    "recipient_address": "Modtagers adresse eller null",
-    "service_description": "Beskrivelse af ydelsen eller null",
-    "quantity": "Antal eller null",
-    "unit_price": "Enhedspris eller null",
-    "total_amount": "Totalbeløb eller null",
-    "currency": "Valuta (f.eks. EUR, DKK) eller null",
-    "creator_name": "Creator/kunstner navn eller null",
-    "artist_name": "Kunstnernavn/handle i parentes eller null",
-    "birth_date": "Fødselsdato eller null",
-    "tax_number": "Skattenummer uden landekode eller null",
-    "tax_country": "Landekode for skat (f.eks. SE, DK) eller null",
-    "vat_status": "Momsstatus eller null"
-  }}
-}}
-
-## FAKTURAKRAV DER SKAL TJEKKES
-
-{requirements_text}
-
-Analysér nu fakturabilledet og svar med UDELUKKENDE JSON-resultatet."""
-
-        else:  # English for PayPal
-            return f"""You are an invoice validator for The Label Sunday ApS.
-
-You need to analyze the uploaded invoice image and verify if it meets all requirements for a **PayPal** invoice.
-
-IMPORTANT RULES:
-- Read all text from the image carefully
-- Do NOT guess missing information
-- If something is not clearly visible, mark it as "missing" or "unclear"
-- Be strict but fair in your evaluation
-- All text responses must be in ENGLISH
-- IMPORTANT: Tax number/TIN can be indicated in various ways: "skattenummer", "tax number", "TIN", "CPR", "personnummer", "personal tax number", "social security number", etc. All of these fulfill the tax number requirement.
-- IMPORTANT: Future dates are acceptable - do NOT flag invoice dates in the future as issues.
-
-## KNOWN CORRECT VALUES FOR THE LABEL SUNDAY
-- Company name: "The Label Sunday ApS"
-- Address: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## CRITICAL: FIX RECOMMENDATIONS
-For EVERY check that is "missing" or "unclear", provide a specific fix_recommendation with correct values. If a value is MISSPELLED, tell the user the exact correct spelling.
-
-## REQUIRED OUTPUT FORMAT (JSON ONLY)
-
-You MUST respond with ONLY valid JSON in this exact format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Name of the requirement",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "The value found in the invoice, or null if not found",
-      "comment": "Brief explanation in English",
-      "fix_recommendation": "Specific instruction with correct values. For Label Sunday fields use the known correct values above. null if status is present."
-    }}
-  ],
-  "missing_items": ["List of missing or invalid fields"],
-  "warnings": ["List of unclear or potentially problematic items"],
-  "layout_suggestions": [],
-  "summary": "A short human-readable conclusion in English",
-  "extracted_data": {{
-    "sender_name": "Sender's full name or null",
-    "sender_address": "Sender's address or null",
-    "sender_email": "Sender's email or null",
-    "sender_phone": "Sender's phone or null",
-    "invoice_number": "Invoice number or null",
-    "invoice_date": "Invoice date or null",
-    "due_date": "Due date or null",
-    "recipient_email": "Recipient's email or null",
-    "recipient_company": "Recipient's company name or null",
-    "recipient_address": "Recipient's address or null",
-    "service_description": "Description of service or null",
-    "quantity": "Quantity or null",
-    "unit_price": "Unit price or null",
-    "total_amount": "Total amount or null",
-    "currency": "Currency (e.g. EUR, DKK) or null",
-    "creator_name": "Creator/artist name or null",
-    "artist_name": "Artist name/handle in parentheses or null",
-    "birth_date": "Date of birth or null",
-    "tax_number": "Tax number without country code or null",
-    "tax_country": "Tax country code (e.g. SE, DK) or null",
-    "vat_status": "VAT status or null"
-  }}
-}}
-
-## INVOICE REQUIREMENTS TO CHECK
-
-{requirements_text}
-
-Now analyze the invoice image and respond with ONLY the JSON result."""
-
-    # For Bank Transfer invoices
-    else:
-        if language == Language.DANISH:
-            return f"""Du er en fakturavalidator for The Label Sunday ApS.
-
-Du skal analysere det uploadede faktura/betalingsanmodning-billede og verificere om den opfylder alle krav for en **Bankoverførsel**.
-
-## VIGTIG KONTEKST FOR BANKOVERFØRSLER
-For bankoverførsler er betalingsmodtageren (den person der skal have pengene) OGSÅ fakturaafsenderen.
-Der er INGEN separat "afsender/seller" information påkrævet - betalingsmodtagerens oplysninger erstatter dette.
-
-## PÅKRÆVEDE FELTER FOR BANKOVERFØRSEL
-1. **Dato** - En dato for dokumentet (kan være "Date", "Dato", "Payment Request Date" eller lignende)
-2. **Beskrivelse af ydelse** - Hvad der betales for
-3. **Beløb og valuta** - Totalbeløb med valuta
-4. **Modtager (Sunday)** - The Label Sunday's navn og adresse
-5. **Betalingsmodtager info** - Følgende felter skal tjekkes SEPARAT:
-   - Navn (fulde navn)
-   - Adresse (gadeadresse) - tjek som SEPARAT felt
-   - Postnummer + by - tjek som SEPARAT felt
-   - Land
-   - Fødselsdato (for udlændinge)
-   - TIN/skattenummer
-6. **Bankoplysninger** - Banknavn, kontonummer/IBAN, SWIFT/BIC
-
-## IKKE PÅKRÆVET FOR BANKOVERFØRSEL
-- Fakturanummer (nice to have, men ikke påkrævet)
-- Forfaldsdato (nice to have, men ikke påkrævet)
-- Separat afsender/seller info (betalingsmodtageren ER afsenderen)
-- Telefonnummer og email (nice to have, men ikke påkrævet)
-
-VIGTIGE REGLER:
-- Læs al tekst fra billedet omhyggeligt
-- Gæt IKKE på manglende information
-- Vær fair i din vurdering - hvis alle PÅKRÆVEDE felter er til stede, skal status være "approved"
-- Alle tekster skal være på DANSK
-- VIGTIGT: Adresse og Postnummer+by er TO SEPARATE felter. Hvis et af dem mangler, skal det rapporteres som et separat manglende felt i missing_items og checks.
-
-## KENDTE KORREKTE VÆRDIER FOR THE LABEL SUNDAY
-- Firmanavn: "The Label Sunday ApS"
-- Adresse: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## VIGTIGT: RETTELSESANBEFALINGER
-For HVERT tjek der er "missing" eller "unclear", giv en specifik fix_recommendation med korrekte værdier. Hvis en værdi er STAVET FORKERT, fortæl den korrekte stavning.
-
-## PÅKRÆVET OUTPUT FORMAT (KUN JSON)
-
-Du SKAL svare med UDELUKKENDE valid JSON i dette præcise format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Navn på kravet",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "Værdien fundet i fakturaen, eller null hvis ikke fundet",
-      "comment": "Kort forklaring på dansk",
-      "fix_recommendation": "Specifik instruktion med korrekte værdier. For Label Sunday felter brug de kendte korrekte værdier ovenfor. null hvis status er present."
-    }}
-  ],
-  "missing_items": ["Liste over manglende PÅKRÆVEDE felter - ignorer valgfrie felter"],
-  "warnings": ["Liste over uklare eller potentielt problematiske elementer"],
-  "layout_suggestions": [],
-  "summary": "En kort menneskelæselig konklusion på dansk"
-}}
-
-## STATUS DEFINITIONER
-- "approved": Alle PÅKRÆVEDE felter er til stede og gyldige (ignorer valgfrie felter som fakturanummer, forfaldsdato, telefon, email)
-- "missing_information": Nogle PÅKRÆVEDE felter mangler (dato, beløb, beskrivelse, Sunday info, betalingsmodtager info, bankoplysninger)
-- "invalid": Kritiske problemer fundet (forkert køber, inkonsistente data, etc.)
-
-Analysér nu fakturabilledet og svar med UDELUKKENDE JSON-resultatet."""
-
-        else:  # English for Bank Transfer
-            return f"""You are an invoice validator for The Label Sunday ApS.
-
-You need to analyze the uploaded invoice/payment request image and verify if it meets all requirements for a **Bank Transfer**.
-
-## IMPORTANT CONTEXT FOR BANK TRANSFERS
-For bank transfers, the payment recipient (the person receiving the money) IS ALSO the invoice sender.
-There is NO separate "sender/seller" information required - the payment recipient's info replaces this.
-
-## REQUIRED FIELDS FOR BANK TRANSFER
-1. **Date** - A date for the document (can be "Date", "Payment Request Date" or similar)
-2. **Service description** - What is being paid for
-3. **Amount and currency** - Total amount with currency
-4. **Recipient (Sunday)** - The Label Sunday's name and address
-5. **Payment recipient info** - The following fields must be checked SEPARATELY:
-   - Name (full name)
-   - Address (street address) - check as SEPARATE field
-   - Postal code + city - check as SEPARATE field
-   - Country
-   - Birth date (for foreigners)
-   - TIN/tax number
-6. **Bank details** - Bank name, account number/IBAN, SWIFT/BIC
-
-## NOT REQUIRED FOR BANK TRANSFER
-- Invoice number (nice to have, but not required)
-- Due date (nice to have, but not required)
-- Separate sender/seller info (the payment recipient IS the sender)
-- Phone number and email (nice to have, but not required)
-
-IMPORTANT RULES:
-- Read all text from the image carefully
-- Do NOT guess missing information
-- Be fair in your evaluation - if all REQUIRED fields are present, status should be "approved"
-- All text responses must be in ENGLISH
-- IMPORTANT: Address and Postal code+city are TWO SEPARATE fields. If one is missing, it should be reported as a separate missing item in missing_items and checks.
-
-## KNOWN CORRECT VALUES FOR THE LABEL SUNDAY
-- Company name: "The Label Sunday ApS"
-- Address: "Vognmagergade 7, 6., 1120 Copenhagen K, Denmark"
-- Email: "info@thelabelsunday.com"
-
-## CRITICAL: FIX RECOMMENDATIONS
-For EVERY check that is "missing" or "unclear", provide a specific fix_recommendation with correct values. If a value is MISSPELLED, tell the user the exact correct spelling.
-
-## REQUIRED OUTPUT FORMAT (JSON ONLY)
-
-You MUST respond with ONLY valid JSON in this exact format:
-
-{{
-  "overall_status": "approved" | "missing_information" | "invalid",
-  "checks": [
-    {{
-      "requirement": "Name of the requirement",
-      "status": "present" | "missing" | "unclear",
-      "found_value": "The value found in the invoice, or null if not found",
-      "comment": "Brief explanation in English",
-      "fix_recommendation": "Specific instruction with correct values. For Label Sunday fields use the known correct values above. null if status is present."
-    }}
-  ],
-  "missing_items": ["List of missing REQUIRED fields - ignore optional fields"],
-  "warnings": ["List of unclear or potentially problematic items"],
-  "layout_suggestions": [],
-  "summary": "A short human-readable conclusion in English"
-}}
-
-## STATUS DEFINITIONS
-- "approved": All REQUIRED fields are present and valid (ignore optional fields like invoice number, due date, phone, email)
-- "missing_information": Some REQUIRED fields are missing (date, amount, description, Sunday info, payment recipient info, bank details)
-- "invalid": Critical issues found (wrong buyer, inconsistent data, etc.)
-
-Now analyze the invoice image and respond with ONLY the JSON result."""
+# Summary shown when an analysis fails, per response language
+ANALYSIS_FAILED_SUMMARY = {
+    Language.DANISH: "Der opstod en fejl ved analyse af fakturaen. Prøv igen.",
+    Language.ENGLISH: "An error occurred while analyzing the invoice. Please try again.",
+}
 
 
-async def validate_invoice_with_image(images_base64: list[str], invoice_type: InvoiceType, language: Language = Language.DANISH) -> ValidationResult:
+def _failed_result(invoice_type: InvoiceType, language: Language, warning: str) -> ValidationResult:
+    """Result returned when the AI response could not be turned into checks."""
+    return ValidationResult(
+        overall_status=OverallStatus.INVALID,
+        invoice_type=invoice_type,
+        checks=[],
+        warnings=[warning],
+        layout_suggestions=[],
+        summary=ANALYSIS_FAILED_SUMMARY[language]
+    )
+
+
+def _result_from_message(message, invoice_type: InvoiceType, language: Language) -> ValidationResult:
+    """Turn Claude's report_validation tool call into a ValidationResult."""
+    if message.stop_reason == "max_tokens":
+        return _failed_result(invoice_type, language, "AI response was cut off at the output token limit")
+    for block in message.content:
+        if block.type == "tool_use":
+            return _build_validation_result(block.input, invoice_type)
+    return _failed_result(invoice_type, language, "AI response did not include a validation report")
+
+
+def _text_request_params(invoice_text: str, invoice_type: InvoiceType, language: Language) -> dict:
+    """Messages API parameters for validating extracted invoice text."""
+    return {
+        "model": CLAUDE_MODEL,
+        "max_tokens": MAX_TOKENS[invoice_type],
+        "tools": [REPORT_VALIDATION_TOOL],
+        "tool_choice": TOOL_CHOICE,
+        "messages": [
+            {"role": "user", "content": _validation_prompt_content(invoice_text, invoice_type, language)}
+        ]
+    }
+
+
+async def validate_invoice(invoice_text: str, invoice_type: InvoiceType, language: Language = Language.DANISH) -> ValidationResult:
     """
-    Validate an invoice using Claude AI with vision capabilities.
+    Validate an invoice using Claude AI.
 
     Args:
-        images_base64: List of base64-encoded PNG images of the invoice pages
+        invoice_text: Extracted text from the invoice
         invoice_type: Type of invoice (paypal or bank_transfer)
         language: Language for responses (da or en)
 
     Returns:
         ValidationResult with all check results
     """
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
-
-    client = Anthropic(api_key=api_key, max_retries=5)
-
-    prompt = get_vision_validation_prompt(invoice_type, language)
-
-    # Build content with images
-    content = []
-    for i, img_base64 in enumerate(images_base64):
-        content.append({
-            "type": "image",
-            "source": {
-                "type": "base64",
-                "media_type": "image/png",
-                "data": img_base64
-            }
-        })
-
-    content.append({
-        "type": "text",
-        "text": prompt
-    })
-
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=4096,
-        messages=[
-            {"role": "user", "content": content}
-        ]
-    )
+    client = get_client()
 
-    # Extract the response text
-    response_text = message.content[0].text
-
-    # Parse the JSON response
-    try:
-        json_start = response_text.find("{")
-        json_end = response_text.rfind("}") + 1
-        if json_start != -1 and json_end > json_start:
-            json_str = response_text[json_start:json_end]
-            result_dict = json.loads(json_str)
-        else:
-            raise ValueError("No JSON object found in response")
-    except json.JSONDecodeError as e:
-        error_msg = "Der opstod en fejl ved analyse af fakturaen. Prøv igen." if language == Language.DANISH else "An error occurred while analyzing the invoice. Please try again."
-        return ValidationResult(
-            overall_status=OverallStatus.INVALID,
-            invoice_type=invoice_type,
-            checks=[],
-            missing_items=[],
-            warnings=[f"Failed to parse AI response: {str(e)}"],
-            layout_suggestions=[],
-            summary=error_msg
-        )
+    message = await client.messages.create(**_text_request_params(invoice_text, invoice_type, language))
 
-    # Convert to Pydantic model
-    checks = [
-        CheckResult(
-            requirement=check["requirement"],
-            status=CheckStatus(check["status"]),
-            found_value=check.get("found_value"),
-            comment=check["comment"],
-            fix_recommendation=check.get("fix_recommendation")
-        )
-        for check in result_dict.get("checks", [])
+    return _result_from_message(message, invoice_type, language)
+
+
+# Vision prompts have no per-request parts, so all four are built at import.
+# They are sent as a cached system prompt ahead of the page images; images
+# differ per invoice and would otherwise sit in front of the static text.
+_vision_system_prompts: dict[tuple[InvoiceType, Language], list[dict]] = {
+    (invoice_type, language): [
+        {
+            "type": "text",
+            "text": get_vision_validation_prompt(invoice_type, language),
+            "cache_control": {"type": "ephemeral"}
+        }
     ]
+    for invoice_type in InvoiceType
+    for language in Language
+}
 
-    layout_suggestions = [
-        LayoutSuggestion(
-            section=suggestion["section"],
-            issue=suggestion["issue"],
-            suggestion=suggestion["suggestion"]
-        )
-        for suggestion in result_dict.get("layout_suggestions", [])
+
+def _image_request_params(images_base64: list[str], invoice_type: InvoiceType, language: Language) -> dict:
+    """Messages API parameters for validating rendered invoice pages."""
+    # One image block per page
+    content = [
+        {"type": "image", "source": {"type": "base64", "media_type": "image/jpeg", "data": img_base64}}
+        for img_base64 in images_base64
     ]
 
-    # Parse extracted data if present
-    extracted_data = None
-    if "extracted_data" in result_dict and result_dict["extracted_data"]:
-        extracted_data = ExtractedInvoiceData(**result_dict["extracted_data"])
+    return {
+        "model": CLAUDE_MODEL,
+        "max_tokens": MAX_TOKENS[invoice_type],
+        "system": _vision_system_prompts[(invoice_type, language)],
+        "tools": [REPORT_VALIDATION_TOOL],
+        "tool_choice": TOOL_CHOICE,
+        "messages": [
+            {"role": "user", "content": content}
+        ]
+    }
 
-    return ValidationResult(
-        overall_status=OverallStatus(result_dict["overall_status"]),
-        invoice_type=invoice_type,
-        checks=checks,
-        missing_items=result_dict.get("missing_items", []),
-        warnings=result_dict.get("warnings", []),
-        layout_suggestions=layout_suggestions,
-        summary=result_dict.get("summary", ""),
-        extracted_data=extracted_data
-    )
+
+async def validate_invoice_with_image(images_base64: list[str], invoice_type: InvoiceType, language: Language = Language.DANISH) -> ValidationResult:
+    """
+    Validate an invoice using Claude AI with vision capabilities.
+
+    Args:
+        images_base64: List of base64-encoded JPEG images of the invoice pages
+        invoice_type: Type of invoice (paypal or bank_transfer)
+        language: Language for responses (da or en)
+
+    Returns:
+        ValidationResult with all check results
+    """
+    client = get_client()
+
+    message = await client.messages.create(**_image_request_params(images_base64, invoice_type, language))
+
+    return _result_from_message(message, invoice_type, language)
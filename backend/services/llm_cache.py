@@ -0,0 +1,61 @@
+"""
+In-memory cache of validation results keyed on invoice content.
+
+Copilot / Power Automate flows frequently retry or resubmit the same
+attachment. Caching the ValidationResult per (PDF hash, invoice type,
+language) lets those duplicates skip text extraction and the Claude call.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from models.schemas import ValidationResult, InvoiceType, Language
+
+# Bump whenever the validation prompts change so stale results are not served
+PROMPT_VERSION = "v2"
+
+CACHE_MAX_ENTRIES = 2048
+CACHE_TTL_SECONDS = 7 * 24 * 3600  # 7 days
+
+# Structure: {cache_key: (result, timestamp)}, least recently used first
+_result_cache: OrderedDict[str, tuple[ValidationResult, float]] = OrderedDict()
+
+
+def hash_content(pdf_bytes: bytes) -> str:
+    """
+    SHA-256 hex digest of the PDF bytes.
+
+    hashlib.sha256 goes straight to OpenSSL (SHA-NI accelerated on modern CPUs)
+    and releases the GIL for large inputs, so callers run it in the threadpool.
+    """
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def make_cache_key(content_hash: str, invoice_type: InvoiceType, language: Language) -> str:
+    """Build the cache key for a PDF hash validated as the given type and language."""
+    return f"{content_hash}:{invoice_type.value}:{language.value}:{PROMPT_VERSION}"
+
+
+def get_cached_result(cache_key: str) -> ValidationResult | None:
+    """Return the cached result for a key, or None if missing or expired."""
+    entry = _result_cache.get(cache_key)
+    if entry is None:
+        return None
+    result, ts = entry
+    if time.time() - ts > CACHE_TTL_SECONDS:
+        del _result_cache[cache_key]
+        return None
+    _result_cache.move_to_end(cache_key)
+    return result
+
+
+def cache_result(cache_key: str, result: ValidationResult) -> None:
+    """Store a validation result, evicting the least recently used entries."""
+    # Failed analyses (e.g. unparseable AI responses) have no checks - let those retry
+    if not result.checks:
+        return
+    _result_cache[cache_key] = (result, time.time())
+    _result_cache.move_to_end(cache_key)
+    while len(_result_cache) > CACHE_MAX_ENTRIES:
+        _result_cache.popitem(last=False)
@@ -1,39 +1,165 @@
-import pdfplumber
+import os
+import threading
+import multiprocessing
 import fitz  # PyMuPDF
-import base64
-from io import BytesIO
+import pybase64
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypeVar
+
+# PDFs with at least this many pages are extracted/rendered in parallel;
+# below it the worker round-trip costs more than it saves
+PARALLEL_PAGE_THRESHOLD = 4
+
+# Pages are rendered for Claude vision at 2x (144 DPI), but never with a long
+# edge above 1568 px - Claude downscales anything larger before reading it, so
+# extra pixels only add upload size and latency
+RENDER_ZOOM = 2
+MAX_IMAGE_EDGE_PX = 1568
+
+# Rendered pages are sent as JPEG: the vision path serves scanned PDFs, where
+# PNG's lossless encoding of paper noise makes pages roughly 10x larger
+JPEG_QUALITY = 85
+
+# Page pool size per server process: the CPUs are shared between all of the
+# server's worker processes (uvicorn reads WEB_CONCURRENCY), each of which has
+# its own pool
+PAGE_POOL_WORKERS = max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("WEB_CONCURRENCY") or 1)))
+
+_page_pool: ProcessPoolExecutor | None = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool for page extraction and rendering, creating it on first use."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            # forkserver, not the default fork: the pool can be created while
+            # other threads hold locks inside MuPDF, ssl or httpx, and a forked
+            # child would inherit those locks held forever
+            _page_pool = ProcessPoolExecutor(
+                max_workers=PAGE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _page_pool
+
+
+def start_page_pool() -> None:
+    """Create the shared page pool up front (called from the app's startup hook)."""
+    _get_page_pool()
+
+
+def shutdown_page_pool() -> None:
+    """Shut down the shared page pool and its worker processes, if it was created."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown()
+            _page_pool = None
+
+
+def _extract_page(page: fitz.Page) -> tuple[str, list[str]]:
+    """
+    Extract the text of one page and its tables, each as pipe-separated rows.
+
+    Pages without a text layer have no table content to find, so table
+    detection is skipped for them.
+    """
+    page_text = page.get_text("text").strip()
+    if not page_text:
+        return page_text, []
+
+    tables = []
+    for table in page.find_tables().tables:
+        rows = table.extract()
+        if rows:
+            tables.append("\n".join(
+                " | ".join(str(cell) if cell else "" for cell in row)
+                for row in rows
+            ))
+    return page_text, tables
+
+
+T = TypeVar("T")
+
+
+def _map_page_range(args: tuple[Callable[[fitz.Page], T], bytes, int, int]) -> list[T]:
+    """Apply a page function to pages [start, stop) - runs inside a pool worker."""
+    page_func, pdf_bytes, start, stop = args
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [page_func(doc[i]) for i in range(start, stop)]
+
+
+def _map_pages(pdf_bytes: bytes, page_func: Callable[[fitz.Page], T]) -> list[T]:
+    """
+    Apply page_func to every page of the PDF, returning the results in page order.
+
+    Large documents are split into one contiguous page range per pool worker and
+    processed in worker processes, so the work is not bound by the GIL.
+    page_func must be a module-level function so it can be sent to the workers.
+    """
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = len(doc)
+        if page_count < PARALLEL_PAGE_THRESHOLD or PAGE_POOL_WORKERS < 2:
+            return [page_func(page) for page in doc]
+
+    chunk_size = -(-page_count // PAGE_POOL_WORKERS)  # ceil division
+    ranges = [
+        (page_func, pdf_bytes, start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+    results = []
+    for chunk in _get_page_pool().map(_map_page_range, ranges):
+        results.extend(chunk)
+    return results
+
+
+def warm_up() -> None:
+    """
+    Run a tiny PDF through text extraction and rendering so MuPDF finishes its
+    one-time initialization before the first real request.
+    """
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "warm-up")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    extract_text_from_pdf(pdf_bytes)
+    pdf_to_images_base64(pdf_bytes)
+
+
+def _render_page(page: fitz.Page) -> str:
+    """Render one page to a base64-encoded JPEG."""
+    # Render at 2x resolution for better quality, capped to what Claude uses
+    zoom = min(RENDER_ZOOM, MAX_IMAGE_EDGE_PX / max(page.rect.width, page.rect.height))
+    mat = fitz.Matrix(zoom, zoom)
+    pix = page.get_pixmap(matrix=mat)
+    # Encode straight to str with pybase64's SIMD encoder, skipping the extra
+    # bytes copy of base64.b64encode(...).decode()
+    return pybase64.b64encode_as_string(pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY))
 
 
 def pdf_to_images_base64(pdf_bytes: bytes) -> list[str]:
     """
-    Convert PDF pages to base64-encoded PNG images.
+    Convert PDF pages to base64-encoded JPEG images.
+
+    Large documents are rendered in worker processes, one contiguous page
+    range per pool worker, the same way as text extraction.
 
     Args:
         pdf_bytes: Raw bytes of the PDF file
 
     Returns:
-        List of base64-encoded PNG images
+        List of base64-encoded JPEG images
     """
-    images = []
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        # Render at 2x resolution for better quality
-        mat = fitz.Matrix(2, 2)
-        pix = page.get_pixmap(matrix=mat)
-        img_bytes = pix.tobytes("png")
-        img_base64 = base64.b64encode(img_bytes).decode("utf-8")
-        images.append(img_base64)
-
-    doc.close()
-    return images
+    return _map_pages(pdf_bytes, _render_page)
 
 
 def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     """
     Extract text content from a PDF file.
-    First tries direct text extraction, returns marker for image-based PDFs.
+    Page text and tables both come from PyMuPDF in a single pass over the
+    document. Returns a marker for image-based PDFs.
 
     Args:
         pdf_bytes: Raw bytes of the PDF file
@@ -43,22 +169,15 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     """
     text_parts = []
 
-    # First, try direct text extraction with pdfplumber
-    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-        for page_num, page in enumerate(pdf.pages, 1):
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(f"--- Page {page_num} ---\n{page_text}")
-
-            # Also extract tables if present
-            tables = page.extract_tables()
-            for table_idx, table in enumerate(tables, 1):
-                if table:
-                    table_text = "\n".join(
-                        " | ".join(str(cell) if cell else "" for cell in row)
-                        for row in table
-                    )
-                    text_parts.append(f"\n[Table {table_idx}]\n{table_text}")
+    pages = _map_pages(pdf_bytes, _extract_page)
+
+    for page_num, (page_text, tables) in enumerate(pages, 1):
+        if page_text:
+            text_parts.append(f"--- Page {page_num} ---\n{page_text}")
+
+        # Also include tables if present
+        for table_idx, table_text in enumerate(tables, 1):
+            text_parts.append(f"\n[Table {table_idx}]\n{table_text}")
 
     full_text = "\n\n".join(text_parts)
 
@@ -9,6 +9,7 @@ Two invoice types are supported:
 2. Bank Transfer Invoice - for payments via bank transfer
 """
 
+from functools import cache
 from typing import Literal
 
 InvoiceType = Literal["paypal", "bank_transfer"]
@@ -167,8 +168,13 @@ BANK_TRANSFER_REQUIREMENTS = {
 }
 
 
+@cache
 def get_requirements_for_type(invoice_type: InvoiceType) -> dict:
-    """Get the complete requirements for a specific invoice type."""
+    """
+    Get the complete requirements for a specific invoice type.
+
+    Built once per type and shared - callers must treat the result as read-only.
+    """
     requirements = {
         "common": COMMON_REQUIREMENTS,
         "type_specific": PAYPAL_REQUIREMENTS if invoice_type == "paypal" else BANK_TRANSFER_REQUIREMENTS
@@ -176,8 +182,9 @@ def get_requirements_for_type(invoice_type: InvoiceType) -> dict:
     return requirements
 
 
+@cache
 def get_requirements_as_text(invoice_type: InvoiceType = "paypal") -> str:
-    """Convert requirements to a text format for the AI prompt."""
+    """Convert requirements to a text format for the AI prompt (rendered once per type)."""
     lines = []
 
     # Invoice type header
@@ -5,127 +5,198 @@ Renders a web page (e.g. PayPal invoice link) in headless Chromium
 and exports it as PDF bytes for the existing invoice analysis pipeline.
 """
 
+import asyncio
 import logging
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+import re
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, Browser, Playwright, TimeoutError as PlaywrightTimeout
 
 logger = logging.getLogger(__name__)
 
 # Timeout for initial page load (ms)
 PAGE_TIMEOUT_MS = 45_000
-# Time to wait for content to render after load event (ms)
-RENDER_WAIT_MS = 5_000
-
-
-async def _dismiss_cookie_banner(page) -> None:
-    """Try to dismiss common cookie/consent banners that may cover invoice content."""
-    selectors = [
+# Upper bound on waiting for the invoice content to render after load (ms)
+RENDER_WAIT_MS = 8_000
+# Upper bound on waiting for trailing requests once the invoice is visible (ms)
+SETTLE_WAIT_MS = 3_000
+
+# Elements that only exist once PayPal has rendered the invoice itself
+INVOICE_CONTENT_SELECTOR = "[data-testid*='invoice'], .invoice-amount"
+INVOICE_CONTENT_TEXT = re.compile(r"Invoice|Faktura", re.IGNORECASE)
+
+# Requests that never affect the rendered invoice text are aborted: media and
+# web fonts by resource type, trackers by host. Images stay (invoice logos).
+BLOCKED_RESOURCE_TYPES = frozenset({"media", "font"})
+# Matched against the request's hostname, exactly or as a parent domain
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.com", "facebook.net", "hotjar.com")
+
+# Common cookie/consent banner buttons that may cover invoice content
+COOKIE_BUTTON_SELECTOR = ", ".join(
+    f"{selector}:visible"
+    for selector in (
         "#acceptAllButton",
         "#gdprCookieBanner button",
         "[data-testid='accept-cookies']",
         "button:has-text('Accept')",
-        "button:has-text('Accept All')",
         "button:has-text('OK')",
-    ]
-    for selector in selectors:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=1000):
-                await btn.click()
-                logger.info(f"Dismissed cookie banner via: {selector}")
-                await page.wait_for_timeout(500)
-                return
-        except Exception:
-            continue
-
-
-async def fetch_pdf_from_url(url: str) -> bytes:
-    """
-    Open a URL in headless Chromium, wait for full render, and return PDF bytes.
-
-    Uses 'domcontentloaded' instead of 'networkidle' because PayPal keeps
-    persistent connections open (analytics/tracking) which prevent networkidle
-    from ever firing.
-    """
-    if not url or not url.startswith(("http://", "https://")):
-        raise ValueError("Invalid URL: must start with http:// or https://")
-
-    async with async_playwright() as p:
-        browser = None
-        try:
-            browser = await p.chromium.launch(
+    )
+)
+
+# Chromium is launched once and shared; each request gets its own context
+_playwright: Playwright | None = None
+_browser: Browser | None = None
+_browser_lock = asyncio.Lock()
+
+
+async def _get_browser() -> Browser:
+    """Return the shared headless Chromium, launching it on first use or after a crash."""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(
                 headless=True,
                 args=[
                     "--no-sandbox",
                     "--disable-blink-features=AutomationControlled",
                 ],
             )
-            context = await browser.new_context(
-                viewport={"width": 1280, "height": 1024},
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/122.0.0.0 Safari/537.36"
-                ),
-                locale="en-US",
-                java_script_enabled=True,
-            )
+        return _browser
 
-            # Remove webdriver flag that PayPal may detect
-            await context.add_init_script(
-                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-            )
 
-            page = await context.new_page()
+async def close_browser() -> None:
+    """Close the shared browser and stop Playwright, if they were started."""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
 
-            logger.info(f"Navigating to invoice URL ({len(url)} chars)")
 
-            # Use 'domcontentloaded' - don't wait for networkidle (PayPal never reaches it)
-            await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT_MS)
+def _is_blocked_host(hostname: str | None) -> bool:
+    """Whether hostname is one of BLOCKED_HOSTS or a subdomain of one."""
+    if not hostname:
+        return False
+    return any(hostname == host or hostname.endswith("." + host) for host in BLOCKED_HOSTS)
 
-            # Wait for JS to render the invoice content
-            logger.info("Waiting for page content to render...")
-            await page.wait_for_timeout(RENDER_WAIT_MS)
 
-            # Try to dismiss cookie banners
-            await _dismiss_cookie_banner(page)
+async def _block_unneeded_requests(route) -> None:
+    """Abort media, font and analytics requests; let everything else through."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(urlsplit(request.url).hostname):
+        await route.abort()
+    else:
+        await route.continue_()
 
-            # Additional wait after dismissing banners
-            await page.wait_for_timeout(2000)
 
-            # Log the final URL and title for debugging
-            final_url = page.url
-            title = await page.title()
-            logger.info(f"Final URL: {final_url[:120]}")
-            logger.info(f"Page title: {title}")
+async def _dismiss_cookie_banner(page) -> None:
+    """Try to dismiss common cookie/consent banners that may cover invoice content."""
+    # One query for the first visible match instead of a round trip per selector
+    btn = page.locator(COOKIE_BUTTON_SELECTOR).first
+    try:
+        if await btn.count():
+            await btn.click()
+            logger.info("Dismissed cookie banner")
+            await page.wait_for_timeout(500)
+    except Exception:
+        pass
 
-            # Check if we ended up on a login page
-            if "signin" in final_url.lower() or "login" in final_url.lower():
-                raise ValueError(
-                    "PayPal redirected to login page. This invoice may require authentication."
-                )
 
-            logger.info("Generating PDF from rendered page")
-            pdf_bytes = await page.pdf(
-                format="A4",
-                print_background=True,
-                margin={"top": "10mm", "right": "10mm", "bottom": "10mm", "left": "10mm"},
-            )
+async def fetch_pdf_from_url(url: str) -> bytes:
+    """
+    Open a URL in headless Chromium, wait for full render, and return PDF bytes.
+
+    Uses 'domcontentloaded' instead of 'networkidle' because PayPal keeps
+    persistent connections open (analytics/tracking) which prevent networkidle
+    from ever firing.
+    """
+    if not url or not url.startswith(("http://", "https://")):
+        raise ValueError("Invalid URL: must start with http:// or https://")
 
-            if not pdf_bytes or len(pdf_bytes) < 100:
-                raise ValueError("Generated PDF is empty or too small")
+    context = None
+    try:
+        browser = await _get_browser()
+        context = await browser.new_context(
+            viewport={"width": 1280, "height": 1024},
+            user_agent=(
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/122.0.0.0 Safari/537.36"
+            ),
+            locale="en-US",
+            java_script_enabled=True,
+        )
+
+        # Remove webdriver flag that PayPal may detect
+        await context.add_init_script(
+            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        )
+        await context.route("**/*", _block_unneeded_requests)
+
+        page = await context.new_page()
+
+        logger.info(f"Navigating to invoice URL ({len(url)} chars)")
+
+        # Use 'domcontentloaded' - don't wait for networkidle (PayPal never reaches it)
+        await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT_MS)
+
+        # Wait for JS to render the invoice content - render anyway on timeout,
+        # the login check below catches pages that never show an invoice
+        logger.info("Waiting for page content to render...")
+        invoice_content = page.locator(INVOICE_CONTENT_SELECTOR).or_(page.get_by_text(INVOICE_CONTENT_TEXT))
+        try:
+            await invoice_content.first.wait_for(timeout=RENDER_WAIT_MS)
+        except PlaywrightTimeout:
+            logger.info("Invoice content not detected, rendering page as is")
 
-            logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
-            return pdf_bytes
+        # Try to dismiss cookie banners
+        await _dismiss_cookie_banner(page)
 
+        # Let requests started by the render (or the banner) finish; PayPal's
+        # persistent connections can keep the network busy, so this is capped
+        try:
+            await page.wait_for_load_state("networkidle", timeout=SETTLE_WAIT_MS)
         except PlaywrightTimeout:
+            pass
+
+        # Log the final URL and title for debugging
+        final_url = page.url
+        title = await page.title()
+        logger.info(f"Final URL: {final_url[:120]}")
+        logger.info(f"Page title: {title}")
+
+        # Check if we ended up on a login page
+        if "signin" in final_url.lower() or "login" in final_url.lower():
             raise ValueError(
-                f"Page load timed out after {PAGE_TIMEOUT_MS // 1000}s. "
-                "The URL may be inaccessible or require authentication."
+                "PayPal redirected to login page. This invoice may require authentication."
             )
-        except ValueError:
-            raise
-        except Exception as e:
-            raise ValueError(f"Failed to render page as PDF: {str(e)}")
-        finally:
-            if browser:
-                await browser.close()
+
+        logger.info("Generating PDF from rendered page")
+        pdf_bytes = await page.pdf(
+            format="A4",
+            print_background=True,
+            margin={"top": "10mm", "right": "10mm", "bottom": "10mm", "left": "10mm"},
+        )
+
+        if not pdf_bytes or len(pdf_bytes) < 100:
+            raise ValueError("Generated PDF is empty or too small")
+
+        logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
+        return pdf_bytes
+
+    except PlaywrightTimeout:
+        raise ValueError(
+            f"Page load timed out after {PAGE_TIMEOUT_MS // 1000}s. "
+            "The URL may be inaccessible or require authentication."
+        )
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Failed to render page as PDF: {str(e)}")
+    finally:
+        if context:
+            await context.close()
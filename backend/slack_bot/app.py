@@ -1,7 +1,10 @@
 import os
 import re
 import time
+import asyncio
 import logging
+from collections import OrderedDict, defaultdict
+from functools import cache
 import httpx
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
@@ -9,6 +12,7 @@ from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
 from services.pdf_parser import extract_text_from_pdf, pdf_to_images_base64
 from services.ai_validator import validate_invoice, validate_invoice_with_image
 from services.url_to_pdf import fetch_pdf_from_url
+from services.llm_cache import hash_content, make_cache_key, get_cached_result, cache_result
 from models.schemas import InvoiceType, Language, ValidationResult
 from slack_bot.formatter import format_validation_result
 
@@ -19,58 +23,116 @@ PAYPAL_URL_PATTERN = re.compile(
     r'https?://(?:www\.)?paypal\.com/invoice/[^\s>|]+'
 )
 
-# Simple in-memory cache for PDF bytes between file upload and button click
-# Structure: {file_id: (pdf_bytes, timestamp)}
-_pdf_cache: dict[str, tuple[bytes, float]] = {}
+# Simple in-memory cache for PDF bytes between file upload and button click,
+# bounded because each entry holds a whole PDF
+# Structure: {file_id: (pdf_bytes, expires_at)}, soonest expiry first; a hit
+# pushes the expiry out and moves the entry to the end, so this is also LRU order
+_pdf_cache: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
 _CACHE_TTL_SECONDS = 600  # 10 minutes
+_MAX_CACHED_PDFS = 32
 
 
 def _cache_pdf(file_id: str, pdf_bytes: bytes) -> None:
-    """Store PDF bytes in cache and clean expired entries."""
+    """Store PDF bytes in cache, evicting expired and least recently used entries."""
     now = time.time()
-    # Clean expired entries
-    expired = [k for k, (_, ts) in _pdf_cache.items() if now - ts > _CACHE_TTL_SECONDS]
-    for k in expired:
-        del _pdf_cache[k]
-    _pdf_cache[file_id] = (pdf_bytes, now)
+    # Entries are ordered by expiry, so expired PDFs sit at the front - drop
+    # them up to the first live one instead of scanning the whole cache
+    while _pdf_cache:
+        _, expires_at = next(iter(_pdf_cache.values()))
+        if expires_at > now:
+            break
+        _pdf_cache.popitem(last=False)
+    _pdf_cache[file_id] = (pdf_bytes, now + _CACHE_TTL_SECONDS)
+    _pdf_cache.move_to_end(file_id)
+    while len(_pdf_cache) > _MAX_CACHED_PDFS:
+        _pdf_cache.popitem(last=False)
 
 
 def _get_cached_pdf(file_id: str) -> bytes | None:
-    """Retrieve PDF bytes from cache if not expired."""
+    """Retrieve PDF bytes from cache if not expired, extending their expiry."""
     entry = _pdf_cache.get(file_id)
     if entry is None:
         return None
-    pdf_bytes, ts = entry
-    if time.time() - ts > _CACHE_TTL_SECONDS:
+    pdf_bytes, expires_at = entry
+    now = time.time()
+    if expires_at <= now:
         del _pdf_cache[file_id]
         return None
+    _pdf_cache[file_id] = (pdf_bytes, now + _CACHE_TTL_SECONDS)
+    _pdf_cache.move_to_end(file_id)
     return pdf_bytes
 
 
-def _get_allowed_channels() -> set[str] | None:
-    """Get allowed channel IDs from env var. Returns None if not configured (allow all)."""
+@cache
+def _get_allowed_channels() -> frozenset[str] | None:
+    """
+    Get allowed channel IDs from env var. Returns None if not configured (allow all).
+
+    Parsed once on first use; call _get_allowed_channels.cache_clear() to
+    pick up a changed SLACK_ALLOWED_CHANNELS.
+    """
     channels = os.environ.get("SLACK_ALLOWED_CHANNELS", "").strip()
     if not channels:
         return None
-    return {ch.strip() for ch in channels.split(",") if ch.strip()}
+    return frozenset(ch.strip() for ch in channels.split(",") if ch.strip())
 
 
 def _is_allowed_channel(channel_id: str) -> bool:
-    """Check if channel is in the allowed list."""
+    """Check if channel is in the allowed list (no list configured allows all)."""
     allowed = _get_allowed_channels()
-    if allowed is None:
-        return True  # No restriction configured
-    return channel_id in allowed
+    return allowed is None or channel_id in allowed
+
+
+# Minimum spacing between bot posts/updates in one channel, in line with
+# Slack's ~1 message per second per channel guidance; pacing here avoids
+# tripping rate limits that the SDK would otherwise back off on
+_CHANNEL_WRITE_INTERVAL_SECONDS = 1.0
+_channel_write_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+_channel_last_write: dict[str, float] = {}
+
+
+async def _pace_channel_write(channel_id: str) -> None:
+    """Wait until the channel's next write slot, then claim it."""
+    async with _channel_write_locks[channel_id]:
+        last_write = _channel_last_write.get(channel_id)
+        if last_write is not None:
+            delay = last_write + _CHANNEL_WRITE_INTERVAL_SECONDS - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        _channel_last_write[channel_id] = time.monotonic()
+
+
+# Shared HTTP client for Slack file downloads - keeps the connection to
+# files.slack.com alive between uploads instead of a handshake per file
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared download client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared download client's pooled connections, if it was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 async def _download_slack_file(url: str, token: str) -> bytes:
     """Download a file from Slack using the bot token for auth."""
-    async with httpx.AsyncClient(timeout=30.0) as http:
-        response = await http.get(
-            url, headers={"Authorization": f"Bearer {token}"}
-        )
-        response.raise_for_status()
-        return response.content
+    response = await _get_http_client().get(
+        url, headers={"Authorization": f"Bearer {token}"}
+    )
+    response.raise_for_status()
+    return response.content
 
 
 async def _process_pdf_bytes(
@@ -78,22 +140,34 @@ async def _process_pdf_bytes(
 ) -> ValidationResult:
     """
     Core processing pipeline - reuses existing services.
-    Mirrors the logic in main.py's analyze endpoints.
+    Mirrors the logic in main.py's analyze endpoints, including the shared
+    result cache, so re-checking the same PDF does not call Claude again.
     """
-    invoice_text = extract_text_from_pdf(pdf_bytes)
+    cache_key = make_cache_key(
+        await asyncio.to_thread(hash_content, pdf_bytes), invoice_type, Language.DANISH
+    )
+    cached = get_cached_result(cache_key)
+    if cached is not None:
+        return cached
+
+    # Parsing and page rendering are CPU-bound - keep them off the event loop
+    invoice_text = await asyncio.to_thread(extract_text_from_pdf, pdf_bytes)
 
     if invoice_text == "[IMAGE_PDF]":
-        images = pdf_to_images_base64(pdf_bytes)
+        images = await asyncio.to_thread(pdf_to_images_base64, pdf_bytes)
         if not images:
             raise ValueError("Kunne ikke konvertere PDF til billeder.")
-        return await validate_invoice_with_image(
+        result = await validate_invoice_with_image(
             images, invoice_type, Language.DANISH
         )
     else:
-        return await validate_invoice(
+        result = await validate_invoice(
             invoice_text, invoice_type, Language.DANISH
         )
 
+    cache_result(cache_key, result)
+    return result
+
 
 def _extract_message_ts(shares: dict, channel_id: str) -> str | None:
     """Extract the message timestamp from file shares for threading."""
@@ -178,15 +252,19 @@ def _register_handlers(slack_app: AsyncApp) -> None:
             if not url_private:
                 return
 
-            pdf_bytes = await _download_slack_file(
-                url_private, os.environ["SLACK_BOT_TOKEN"]
-            )
+            # Slack files are immutable, so a redelivered file_shared event for
+            # a file that is still cached needs no second download
+            if _get_cached_pdf(file_id) is None:
+                pdf_bytes = await _download_slack_file(
+                    url_private, os.environ["SLACK_BOT_TOKEN"]
+                )
 
-            # Cache PDF for when user clicks a button
-            _cache_pdf(file_id, pdf_bytes)
+                # Cache PDF for when user clicks a button
+                _cache_pdf(file_id, pdf_bytes)
 
             # Send type selection buttons
             blocks = _build_type_selection_blocks(file_id, filename)
+            await _pace_channel_write(channel_id)
             await say(
                 text=f"{filename} modtaget! Hvilken type faktura er det?",
                 blocks=blocks,
@@ -195,6 +273,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
             )
         except Exception as e:
             logger.exception(f"Error handling file {file_id}")
+            await _pace_channel_write(channel_id)
             await say(
                 text=f":x: Fejl ved behandling af fil: {str(e)}",
                 channel=channel_id,
@@ -224,6 +303,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
         type_label = "PayPal faktura" if invoice_type == InvoiceType.PAYPAL else "Bankoverførsel"
 
         # Update the button message to show processing status
+        await _pace_channel_write(channel_id)
         await client.chat_update(
             channel=channel_id,
             ts=message_ts,
@@ -242,6 +322,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
         try:
             pdf_bytes = _get_cached_pdf(file_id)
             if pdf_bytes is None:
+                await _pace_channel_write(channel_id)
                 await client.chat_update(
                     channel=channel_id,
                     ts=message_ts,
@@ -262,6 +343,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
 
             # Format result as Block Kit
             blocks = format_validation_result(result, type_label)
+            await _pace_channel_write(channel_id)
             await client.chat_update(
                 channel=channel_id,
                 ts=message_ts,
@@ -274,6 +356,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
 
         except Exception as e:
             logger.exception(f"Error processing file {file_id} as {invoice_type.value}")
+            await _pace_channel_write(channel_id)
             await client.chat_update(
                 channel=channel_id,
                 ts=message_ts,
@@ -303,15 +386,16 @@ def _register_handlers(slack_app: AsyncApp) -> None:
         text = event.get("text", "")
         message_ts = event.get("ts")
 
-        # Check for PayPal URLs
-        urls = PAYPAL_URL_PATTERN.findall(text)
-        if not urls:
+        # Cheap substring test first - most messages contain no invoice link
+        if "paypal.com/invoice/" not in text:
             return
 
-        for url in urls:
-            # Clean Slack auto-link formatting
-            url = url.strip("<>").split("|")[0]
+        # The pattern stops at whitespace, ">" and "|", so Slack's <url|label>
+        # auto-link formatting is already excluded from each match
+        for match in PAYPAL_URL_PATTERN.finditer(text):
+            url = match.group(0)
 
+            await _pace_channel_write(channel_id)
             processing_msg = await say(
                 text=":hourglass_flowing_sand: Henter og analyserer PayPal faktura...",
                 channel=channel_id,
@@ -323,6 +407,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
                 result = await _process_pdf_bytes(pdf_bytes, InvoiceType.PAYPAL)
 
                 blocks = format_validation_result(result, "PayPal faktura (link)")
+                await _pace_channel_write(channel_id)
                 await client.chat_update(
                     channel=channel_id,
                     ts=processing_msg["ts"],
@@ -331,6 +416,7 @@ def _register_handlers(slack_app: AsyncApp) -> None:
                 )
             except Exception as e:
                 logger.exception(f"Error processing URL: {url[:80]}")
+                await _pace_channel_write(channel_id)
                 await client.chat_update(
                     channel=channel_id,
                     ts=processing_msg["ts"],
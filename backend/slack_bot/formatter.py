@@ -1,17 +1,44 @@
-from models.schemas import ValidationResult, CheckStatus
+from models.schemas import ValidationResult, CheckStatus, OverallStatus
 
-# Status emoji mapping
-STATUS_EMOJI = {
-    "approved": ":white_check_mark:",
-    "missing_information": ":warning:",
-    "invalid": ":x:",
+# Status emoji and Danish label per overall status
+STATUS_DISPLAY = {
+    OverallStatus.APPROVED: (":white_check_mark:", "Godkendt"),
+    OverallStatus.MISSING_INFORMATION: (":warning:", "Mangler information"),
+    OverallStatus.INVALID: (":x:", "Ugyldig"),
 }
 
-STATUS_TEXT_DA = {
-    "approved": "Godkendt",
-    "missing_information": "Mangler information",
-    "invalid": "Ugyldig",
-}
+# Slack has 3000 char limit per section text - section texts are cut below it
+SECTION_TEXT_LIMIT = 2900
+
+# Blocks are only serialized, never mutated, so static ones can be shared
+DIVIDER_BLOCK = {"type": "divider"}
+
+
+def _join_capped(heading: str, lines: list[str]) -> str:
+    """
+    Join a section heading and its lines, truncated to SECTION_TEXT_LIMIT.
+
+    Stops joining once the limit is passed, so an oversized section does not
+    build the full text only to throw most of it away.
+    """
+    parts = [heading]
+    size = len(heading)
+    for line in lines:
+        parts.append(line)
+        size += 1 + len(line)
+        if size > SECTION_TEXT_LIMIT:
+            return "\n".join(parts)[:SECTION_TEXT_LIMIT] + "\n..."
+    return "\n".join(parts)
+
+
+def _summary_footer(summary: str) -> dict:
+    """Context block with the validator's summary."""
+    return {
+        "type": "context",
+        "elements": [
+            {"type": "mrkdwn", "text": f":memo: {summary}"},
+        ],
+    }
 
 
 def format_validation_result(
@@ -27,14 +54,16 @@ def format_validation_result(
     Returns:
         List of Block Kit block dicts
     """
-    status_val = result.overall_status.value
-    emoji = STATUS_EMOJI.get(status_val, ":question:")
-    status_da = STATUS_TEXT_DA.get(status_val, status_val)
+    emoji, status_da = STATUS_DISPLAY[result.overall_status]
 
-    present = [c for c in result.checks if c.status == CheckStatus.PRESENT]
-    missing = [c for c in result.checks if c.status == CheckStatus.MISSING]
-    unclear = [c for c in result.checks if c.status == CheckStatus.UNCLEAR]
-    total = len(present) + len(missing) + len(unclear)
+    # Group the checks by status in a single pass
+    checks_by_status = {status: [] for status in CheckStatus}
+    for c in result.checks:
+        checks_by_status[c.status].append(c)
+    present = checks_by_status[CheckStatus.PRESENT]
+    missing = checks_by_status[CheckStatus.MISSING]
+    unclear = checks_by_status[CheckStatus.UNCLEAR]
+    total = len(result.checks)
 
     blocks: list[dict] = []
 
@@ -60,20 +89,22 @@ def format_validation_result(
         },
     })
 
-    blocks.append({"type": "divider"})
+    # Nothing to list (e.g. a failed analysis) - only the summary follows
+    if not total:
+        if result.summary:
+            blocks.append(_summary_footer(result.summary))
+        return blocks
+
+    blocks.append(DIVIDER_BLOCK)
 
     # Present checks
     if present:
-        lines = []
-        for c in present:
-            line = f":white_check_mark: {c.requirement}"
-            if c.found_value:
-                line += f" — _{c.found_value}_"
-            lines.append(line)
-        # Slack has 3000 char limit per section text — truncate if needed
-        text = "*Fundet og OK:*\n" + "\n".join(lines)
-        if len(text) > 2900:
-            text = text[:2900] + "\n..."
+        lines = [
+            f":white_check_mark: {c.requirement}"
+            + (f" — _{c.found_value}_" if c.found_value else "")
+            for c in present
+        ]
+        text = _join_capped("*Fundet og OK:*", lines)
         blocks.append({
             "type": "section",
             "text": {"type": "mrkdwn", "text": text},
@@ -81,16 +112,13 @@ def format_validation_result(
 
     # Missing checks
     if missing:
-        blocks.append({"type": "divider"})
-        lines = []
-        for c in missing:
-            line = f":x: *{c.requirement}*"
-            if c.fix_recommendation:
-                line += f"\n     _{c.fix_recommendation}_"
-            lines.append(line)
-        text = "*Mangler:*\n" + "\n".join(lines)
-        if len(text) > 2900:
-            text = text[:2900] + "\n..."
+        blocks.append(DIVIDER_BLOCK)
+        lines = [
+            f":x: *{c.requirement}*"
+            + (f"\n     _{c.fix_recommendation}_" if c.fix_recommendation else "")
+            for c in missing
+        ]
+        text = _join_capped("*Mangler:*", lines)
         blocks.append({
             "type": "section",
             "text": {"type": "mrkdwn", "text": text},
@@ -98,30 +126,22 @@ def format_validation_result(
 
     # Unclear checks
     if unclear:
-        blocks.append({"type": "divider"})
-        lines = []
-        for c in unclear:
-            line = f":warning: *{c.requirement}*"
-            if c.found_value:
-                line += f" (fundet: _{c.found_value}_)"
-            if c.fix_recommendation:
-                line += f"\n     _{c.fix_recommendation}_"
-            lines.append(line)
-        text = "*Uklart:*\n" + "\n".join(lines)
-        if len(text) > 2900:
-            text = text[:2900] + "\n..."
+        blocks.append(DIVIDER_BLOCK)
+        lines = [
+            f":warning: *{c.requirement}*"
+            + (f" (fundet: _{c.found_value}_)" if c.found_value else "")
+            + (f"\n     _{c.fix_recommendation}_" if c.fix_recommendation else "")
+            for c in unclear
+        ]
+        text = _join_capped("*Uklart:*", lines)
         blocks.append({
             "type": "section",
             "text": {"type": "mrkdwn", "text": text},
         })
 
     # Summary footer
-    blocks.append({"type": "divider"})
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {"type": "mrkdwn", "text": f":memo: {result.summary}"},
-        ],
-    })
+    if result.summary:
+        blocks.append(DIVIDER_BLOCK)
+        blocks.append(_summary_footer(result.summary))
 
     return blocks